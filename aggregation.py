@@ -0,0 +1,145 @@
+"""Накопительные итоги тренировок по спортсменам и периодам."""
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple, Union
+
+from homework import InfoMessage
+
+Timestamp = Union[datetime, date, float, int]
+
+SNAPSHOT_VERSION: int = 1
+
+
+@dataclass
+class Totals:
+    """Накопленные суммы за период."""
+
+    __slots__ = ('count', 'duration', 'distance', 'calories')
+
+    count: int
+    duration: float
+    distance: float
+    calories: float
+
+    def add(self, message: InfoMessage) -> None:
+        """Учесть одну тренировку."""
+        self.count += 1
+        self.duration += message.duration
+        self.distance += message.distance
+        self.calories += message.calories
+
+    @property
+    def mean_distance(self) -> float:
+        """Средняя дистанция за тренировку, км."""
+        return self.distance / self.count if self.count else 0.0
+
+    @property
+    def mean_calories(self) -> float:
+        """Среднее количество калорий за тренировку."""
+        return self.calories / self.count if self.count else 0.0
+
+    @property
+    def mean_speed(self) -> float:
+        """Средняя скорость за период, км/ч."""
+        return self.distance / self.duration if self.duration else 0.0
+
+
+def _to_date(timestamp: Timestamp) -> date:
+    """Привести отметку времени к дате (UTC для чисел)."""
+    if isinstance(timestamp, datetime):
+        return timestamp.date()
+    if isinstance(timestamp, date):
+        return timestamp
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).date()
+
+
+def day_bucket(timestamp: Timestamp) -> str:
+    """Ключ дневного периода: дата в формате ISO."""
+    return _to_date(timestamp).isoformat()
+
+
+def week_bucket(timestamp: Timestamp) -> str:
+    """Ключ недельного периода: дата понедельника в формате ISO."""
+    day = _to_date(timestamp)
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+PERIODS = {
+    'day': day_bucket,
+    'week': week_bucket,
+}
+
+
+class AggregationStore:
+    """Хранилище накопительных итогов с обновлением за O(1)."""
+
+    def __init__(self, periods: Tuple[str, ...] = tuple(PERIODS)) -> None:
+        unknown = set(periods) - set(PERIODS)
+        if unknown:
+            raise KeyError('Неизвестные периоды: ' + ', '.join(unknown)
+                           + '. Доступные периоды: ' + ', '.join(PERIODS))
+        self.periods = tuple(periods)
+        self._totals: Dict[Tuple[str, str], Dict[str, Totals]] = {}
+
+    def add(self,
+            athlete: str,
+            timestamp: Timestamp,
+            message: InfoMessage) -> None:
+        """Учесть тренировку во всех периодах спортсмена."""
+        for period in self.periods:
+            buckets = self._totals.setdefault((athlete, period), {})
+            bucket = PERIODS[period](timestamp)
+            totals = buckets.get(bucket)
+            if totals is None:
+                totals = buckets[bucket] = Totals(0, 0.0, 0.0, 0.0)
+            totals.add(message)
+
+    def get(self,
+            athlete: str,
+            period: str,
+            timestamp: Timestamp) -> Optional[Totals]:
+        """Получить итоги периода, содержащего timestamp."""
+        buckets = self._totals.get((athlete, period), {})
+        return buckets.get(PERIODS[period](timestamp))
+
+    def buckets(self, athlete: str, period: str) -> Dict[str, Totals]:
+        """Получить все периоды спортсмена по ключам."""
+        return dict(self._totals.get((athlete, period), {}))
+
+    def athletes(self) -> Tuple[str, ...]:
+        """Получить спортсменов, по которым есть итоги."""
+        return tuple(sorted({athlete for athlete, _ in self._totals}))
+
+    def snapshot(self, path: str) -> None:
+        """Атомарно сохранить итоги в файл JSON."""
+        data = {
+            'version': SNAPSHOT_VERSION,
+            'periods': list(self.periods),
+            'totals': [
+                [athlete, period, bucket, asdict(totals)]
+                for (athlete, period), buckets in self._totals.items()
+                for bucket, totals in buckets.items()
+            ],
+        }
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    @classmethod
+    def restore(cls, path: str) -> 'AggregationStore':
+        """Загрузить итоги, сохраненные методом snapshot."""
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        if data.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f'Неподдерживаемая версия снимка: '
+                             f'{data.get("version")}')
+        store = cls(tuple(data['periods']))
+        for athlete, period, bucket, totals in data['totals']:
+            buckets = store._totals.setdefault((athlete, period), {})
+            buckets[bucket] = Totals(**totals)
+        return store
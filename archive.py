@@ -0,0 +1,250 @@
+"""Архив входных данных тренировок с индексом по спортсмену и времени.
+
+Для каждого кода тренировки в каталоге архива хранится файл
+<код>.dat с записями фиксированной длины (little-endian):
+
+    athlete:q timestamp:d <значения пакета в раскладке binary.py>
+
+Записи только дописываются. Рядом лежит индекс <код>.idx.json:
+для каждого спортсмена отсортированные отметки времени и номера
+записей. Запрос по диапазону находит номера записей двоичным поиском
+и читает через mmap только нужные записи.
+"""
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from batch import BatchResult, compute_batch, field_names
+from binary import BYTE_ORDER, payload_struct, payload_values
+from homework import get_training_class
+
+HEADER_FORMAT: str = 'qd'
+
+Record = Tuple[str, int, float, tuple]
+
+
+class _Index:
+    """Индекс записей одного кода: спортсмен -> (время, номер записи)."""
+
+    def __init__(self) -> None:
+        self.entries: Dict[int, Tuple[array, array]] = {}
+        self.count = 0
+
+    def add(self, athlete: int, timestamp: float, record: int) -> None:
+        times, records = self.entries.setdefault(
+            athlete, (array('d'), array('q')))
+        if not times or timestamp >= times[-1]:
+            times.append(timestamp)
+            records.append(record)
+        else:
+            position = bisect_right(times, timestamp)
+            times.insert(position, timestamp)
+            records.insert(position, record)
+        self.count = max(self.count, record + 1)
+
+    def find(self, athlete: int, start: float, end: float) -> array:
+        """Номера записей спортсмена с отметками в [start, end)."""
+        if athlete not in self.entries:
+            return array('q')
+        times, records = self.entries[athlete]
+        return records[bisect_left(times, start):bisect_left(times, end)]
+
+    def dump(self, path: Path) -> None:
+        """Записать индекс атомарно и с fsync, как и файл записей."""
+        temporary = path.with_name(path.name + '.tmp')
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({
+                'count': self.count,
+                'entries': {str(athlete): [list(times), list(records)]
+                            for athlete, (times, records)
+                            in self.entries.items()},
+            }))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Path) -> '_Index':
+        data = json.loads(path.read_text())
+        index = cls()
+        index.count = data['count']
+        for athlete, (times, records) in data['entries'].items():
+            index.entries[int(athlete)] = (array('d', times),
+                                           array('q', records))
+        return index
+
+
+class _CodeArchive:
+    """Файл записей и индекс одного кода тренировки."""
+
+    def __init__(self, directory: Path, workout_type: str) -> None:
+        self.workout_type = workout_type
+        self.record = struct.Struct(
+            BYTE_ORDER + HEADER_FORMAT
+            + payload_struct(workout_type).format[1:])
+        self.data_path = directory / f'{workout_type}.dat'
+        self.index_path = directory / f'{workout_type}.idx.json'
+        self.data_path.touch()
+        self._drop_torn_record()
+        self.index = self._load_index()
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def _drop_torn_record(self) -> None:
+        """Отрезать недописанную запись в конце файла после сбоя."""
+        size = self.data_path.stat().st_size
+        if size % self.record.size:
+            os.truncate(self.data_path, size - size % self.record.size)
+
+    def _records_on_disk(self) -> int:
+        return self.data_path.stat().st_size // self.record.size
+
+    def _load_index(self) -> _Index:
+        count = self._records_on_disk()
+        if self.index_path.exists():
+            index = _Index.load(self.index_path)
+            if index.count == count:
+                return index
+        return self._rebuild_index(count)
+
+    def _rebuild_index(self, count: int) -> _Index:
+        """Построить индекс заново, прочитав заголовки всех записей."""
+        index = _Index()
+        header = struct.Struct(BYTE_ORDER + HEADER_FORMAT)
+        with open(self.data_path, 'rb') as file:
+            for number in range(count):
+                file.seek(number * self.record.size)
+                athlete, timestamp = header.unpack(file.read(header.size))
+                index.add(athlete, timestamp, number)
+        return index
+
+    def append(self, athlete: int, timestamp: float, data: Sequence) -> None:
+        if self._file is None:
+            self._file = open(self.data_path, 'ab')
+        self._file.write(self.record.pack(
+            athlete, timestamp, *payload_values(self.workout_type, data)))
+        self.index.add(athlete, timestamp, self.index.count)
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self.index.dump(self.index_path)
+
+    def _mapped(self) -> mmap.mmap:
+        size = self.index.count * self.record.size
+        if self._map is None or len(self._map) < size:
+            if self._file is not None:
+                self._file.flush()
+            if self._map is not None:
+                self._map.close()
+            with open(self.data_path, 'rb') as file:
+                self._map = mmap.mmap(file.fileno(), size,
+                                      access=mmap.ACCESS_READ)
+        return self._map
+
+    def read(self, numbers: Sequence[int]) -> Iterator[Tuple[int, float,
+                                                             tuple]]:
+        if not len(numbers):
+            return
+        mapped = self._mapped()
+        for number in numbers:
+            athlete, timestamp, *data = self.record.unpack_from(
+                mapped, number * self.record.size)
+            yield athlete, timestamp, tuple(data)
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class SessionArchive:
+    """Архив тренировок с запросами по спортсмену и диапазону времени."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._codes: Dict[str, _CodeArchive] = {}
+        for path in self.directory.glob('*.dat'):
+            self._code(path.stem)
+
+    def _code(self, workout_type: str) -> _CodeArchive:
+        if workout_type not in self._codes:
+            get_training_class(workout_type)
+            self._codes[workout_type] = _CodeArchive(self.directory,
+                                                     workout_type)
+        return self._codes[workout_type]
+
+    def append(self,
+               athlete: int,
+               timestamp: float,
+               workout_type: str,
+               data: Sequence) -> None:
+        """Дописать тренировку в архив."""
+        self._code(workout_type).append(athlete, timestamp, data)
+
+    def __len__(self) -> int:
+        return sum(code.index.count for code in self._codes.values())
+
+    def query(self,
+              athlete: int,
+              start: float,
+              end: float,
+              workout_type: Optional[str] = None) -> Iterator[Record]:
+        """Тренировки спортсмена с отметками времени в [start, end)."""
+        codes = ([workout_type] if workout_type is not None
+                 else sorted(self._codes))
+        for code in codes:
+            if code not in self._codes:
+                continue
+            archive = self._codes[code]
+            for _, timestamp, data in archive.read(
+                    archive.index.find(athlete, start, end)):
+                yield code, athlete, timestamp, data
+
+    def query_columns(self,
+                      athlete: int,
+                      start: float,
+                      end: float) -> Dict[str, Dict[str, List]]:
+        """Результат запроса в виде колонок по кодам тренировок."""
+        groups: Dict[str, Dict[str, List]] = {}
+        for code, _, _, data in self.query(athlete, start, end):
+            if code not in groups:
+                groups[code] = {name: [] for name in
+                                field_names(get_training_class(code))}
+            for column, value in zip(groups[code].values(), data):
+                column.append(value)
+        return groups
+
+    def compute(self,
+                athlete: int,
+                start: float,
+                end: float) -> Dict[str, BatchResult]:
+        """Рассчитать показатели тренировок из диапазона пачками."""
+        return {code: compute_batch(code, columns) for code, columns
+                in self.query_columns(athlete, start, end).items()}
+
+    def flush(self) -> None:
+        """Сбросить записи на диск и сохранить индексы."""
+        for archive in self._codes.values():
+            archive.flush()
+
+    def close(self) -> None:
+        for archive in self._codes.values():
+            archive.close()
+
+    def __enter__(self) -> 'SessionArchive':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,227 @@
+"""Пакетный (колоночный) расчет показателей тренировок.
+
+Точность расчета задается параметром precision: 'float64' (по
+умолчанию, совпадает с расчетом по одному пакету бит в бит) или
+'float32' (вдвое меньше памяти на колонки и результаты).
+Оценки ошибки float32 относительно float64 (u = 2**-24 ~ 6e-8):
+
+* входы: целые action и count_pool до 2**24 представимы точно,
+  дробные значения округляются с относительной ошибкой не больше u;
+* distance, speed и calories у Swimming: несколько умножений
+  и делений, относительная ошибка не больше ~10u ~ 1e-6;
+* calories у Running: в скобках вычитается CAL_RUN_SPEED_PARAM,
+  поэтому ошибка ~10u умножается на 18 * speed / |18 * speed - 20|
+  и растет около speed = 1.11 км/ч, где калории близки к нулю;
+  абсолютная ошибка при этом не больше ~1e-6 от
+  18 * speed * weight / 1000 * duration * 60;
+* calories у SportsWalking: ~10u, пока speed**2 / height не близко
+  к целому. У границы целого "//" может дать соседнее значение,
+  тогда ошибка равна CAL_WLK_SPEEDHEIGHT_COEF * weight * duration * 60
+  ккал (0.029 ккал на кг за минуту).
+
+Без numpy промежуточные вычисления идут в float64 Python: ошибку
+дают только округление входов (если колонки хранятся в float32,
+например в compact.TrainingStore) и результатов.
+"""
+import inspect
+from array import array
+from dataclasses import dataclass
+from typing import (Dict, Iterable, Iterator, List, Mapping, Sequence,
+                    Tuple, Type)
+
+from homework import InfoMessage, Training, get_training_class
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость.
+    np = None
+
+PRECISIONS: Dict[str, str] = {'float64': 'd', 'float32': 'f'}
+
+
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY,
+               inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def _fields(training_class: Type[Training]) -> List[inspect.Parameter]:
+    """Позиционные параметры __init__ без self - поля пакета."""
+    parameters = inspect.signature(training_class.__init__).parameters
+    return [parameter for parameter in list(parameters.values())[1:]
+            if parameter.kind in _POSITIONAL]
+
+
+def field_names(training_class: Type[Training]) -> Tuple[str, ...]:
+    """Получить имена колонок для класса тренировки."""
+    return tuple(parameter.name for parameter in _fields(training_class))
+
+
+def field_defaults(training_class: Type[Training]) -> Dict[str, object]:
+    """Получить значения по умолчанию необязательных полей."""
+    return {parameter.name: parameter.default
+            for parameter in _fields(training_class)
+            if parameter.default is not parameter.empty}
+
+
+def complete_row(training_class: Type[Training], data: Sequence) -> Sequence:
+    """
+    Дополнить данные пакета значениями по умолчанию необязательных
+    полей. Число значений проверяется так же, как в read_package.
+    """
+    names = field_names(training_class)
+    if len(data) == len(names):
+        return data
+    defaults = field_defaults(training_class)
+    low = len(names) - len(defaults)
+    if not low <= len(data) <= len(names):
+        expected = (str(low) if low == len(names)
+                    else f'от {low} до {len(names)}')
+        raise TypeError(f'{training_class.__name__} ожидает {expected} '
+                        f'значений, получено {len(data)}.')
+    return [*data, *(defaults[name] for name in names[len(data):])]
+
+
+@dataclass
+class BatchResult:
+    """Результаты расчета для пачки тренировок одного типа."""
+
+    training_type: str
+    duration: Sequence[float]
+    distance: Sequence[float]
+    speed: Sequence[float]
+    calories: Sequence[float]
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+    def to_messages(self) -> Iterator[InfoMessage]:
+        """Построчно получить объекты InfoMessage."""
+        for row in zip(self.duration, self.distance,
+                       self.speed, self.calories):
+            yield InfoMessage(self.training_type, *map(float, row))
+
+
+def float_typecode(precision: str) -> str:
+    """Получить код типа array для точности расчета."""
+    try:
+        return PRECISIONS[precision]
+    except KeyError:
+        raise ValueError(f'Неизвестная точность: {precision}. Доступные: '
+                         + ', '.join(PRECISIONS)) from None
+
+
+def _compute_vectorized(training_class: Type[Training],
+                        columns: List[Sequence],
+                        typecode: str = 'd') -> Tuple:
+    """
+    Посчитать пачку целиком, подставив массивы numpy в класс.
+    Деление на ноль, как и в расчете по одному пакету, вызывает
+    ZeroDivisionError, а не дает inf или nan.
+    """
+    arrays = [np.ascontiguousarray(column, dtype=typecode)
+              for column in columns]
+    training = training_class(*arrays)
+    try:
+        with np.errstate(divide='raise', invalid='raise'):
+            return (training.duration,
+                    training.get_distance(),
+                    training.get_mean_speed(),
+                    training.get_spent_calories())
+    except FloatingPointError as error:
+        raise ZeroDivisionError(f'{training_class.__name__}: {error}'
+                                ) from error
+
+
+def _compute_scalar(training_class: Type[Training],
+                    columns: List[Sequence],
+                    typecode: str = 'd') -> Tuple:
+    """Посчитать пачку построчно без numpy."""
+    duration, distance, speed, calories = (array(typecode)
+                                           for _ in range(4))
+    for row in zip(*columns):
+        training = training_class(*row)
+        duration.append(training.duration)
+        distance.append(training.get_distance())
+        speed.append(training.get_mean_speed())
+        calories.append(training.get_spent_calories())
+    return duration, distance, speed, calories
+
+
+def compute_columns(training_class: Type[Training],
+                    columns: Mapping[str, Sequence],
+                    precision: str = 'float64') -> BatchResult:
+    """
+    Рассчитать показатели для колонок заданного класса тренировки.
+    Отсутствующие колонки необязательных полей заполняются значениями
+    по умолчанию.
+    """
+    typecode = float_typecode(precision)
+    names = field_names(training_class)
+    defaults = field_defaults(training_class)
+    missing = [name for name in names
+               if name not in columns and name not in defaults]
+    if missing:
+        raise KeyError(f'Для {training_class.__name__} не хватает колонок: '
+                       + ', '.join(missing))
+    sizes = {len(columns[name]) for name in names if name in columns}
+    if len(sizes) > 1:
+        raise ValueError('Колонки пачки должны быть одной длины.')
+    size = sizes.pop() if sizes else 0
+    ordered = [columns[name] if name in columns else [defaults[name]] * size
+               for name in names]
+    compute = _compute_vectorized if np is not None else _compute_scalar
+    return BatchResult(training_class.__name__,
+                       *compute(training_class, ordered, typecode))
+
+
+def compute_batch(workout_type: str,
+                  columns: Mapping[str, Sequence],
+                  precision: str = 'float64') -> BatchResult:
+    """
+    Рассчитать дистанцию, скорость и калории для колонок
+    одного кода тренировки.
+    """
+    return compute_columns(get_training_class(workout_type), columns,
+                           precision)
+
+
+def compute_batches(
+        groups: Mapping[str, Mapping[str, Sequence]],
+        precision: str = 'float64'
+) -> Dict[str, BatchResult]:
+    """Рассчитать несколько пачек, сгруппированных по коду тренировки."""
+    return {workout_type: compute_batch(workout_type, columns, precision)
+            for workout_type, columns in groups.items()}
+
+
+def group_packages(
+        packages: Iterable[Tuple[str, Sequence]]
+) -> Dict[str, Dict[str, list]]:
+    """
+    Разложить пакеты (код, данные) по колонкам для каждого кода.
+    Пропущенные необязательные значения заполняются по умолчанию.
+    """
+    groups: Dict[str, Dict[str, list]] = {}
+    for workout_type, data in packages:
+        if workout_type not in groups:
+            names = field_names(get_training_class(workout_type))
+            groups[workout_type] = {name: [] for name in names}
+        columns = groups[workout_type]
+        if len(data) != len(columns):
+            data = complete_row(get_training_class(workout_type), data)
+        for column, value in zip(columns.values(), data):
+            column.append(value)
+    return groups
+
+
+def compute_packages(
+        packages: Sequence[Tuple[str, Sequence]],
+        precision: str = 'float64'
+) -> List[InfoMessage]:
+    """
+    Рассчитать пакеты разных кодов пачками и вернуть сообщения
+    в порядке входных пакетов.
+    """
+    results = compute_batches(group_packages(packages), precision)
+    messages = {workout_type: result.to_messages()
+                for workout_type, result in results.items()}
+    return [next(messages[workout_type]) for workout_type, _ in packages]
@@ -0,0 +1,269 @@
+"""Сравнение альтернативных движков расчета с эталонными классами.
+
+Эталон - Running, SportsWalking и Swimming из homework.py, по одному
+пакету. Каждый зарегистрированный движок считает те же случайные
+и граничные пакеты; поля сообщений должны совпасть с эталоном
+в пределах объявленных для движка допусков. Для каждого движка
+и вида тренировки печатается ускорение относительно эталона.
+Пакеты генерируются только из допустимой области (duration > 0).
+
+Запуск:
+    python -m benchmarks.differential --size 100000 -o report.json
+"""
+import argparse
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from batch import compute_packages
+from benchmarks.suite import MIXES, make_packages, measure
+from cache import MessageCache
+from compact import TrainingStore
+from homework import InfoMessage, read_package
+from parallel import iter_messages_parallel
+
+Package = Tuple[str, list]
+Compute = Callable[[Sequence[Package]], List[InfoMessage]]
+
+FIELDS: Tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+WORKOUT_TYPES: Tuple[str, ...] = ('RUN', 'WLK', 'SWM')
+SIZE: int = 10_000
+# Насколько близко к целому должно быть speed**2 / height, чтобы
+# float32 мог дать соседнее значение "//" (оценка ~10u из batch.py).
+FLOOR_REL_TOL: float = 1e-5
+
+EDGE_PACKAGES: List[Package] = [
+    ('RUN', [0, 1, 75]),
+    ('RUN', [1, 1e-6, 1]),
+    ('RUN', [10 ** 9, 1000, 500]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12.5, 6]),
+    ('WLK', [0, 1, 75, 180]),
+    ('WLK', [9000, 1, 75, 180]),
+    # speed**2 / height у границы целого (duration = 1.3 / k): ровно
+    # 9, чуть выше 9 и чуть ниже 9 и 4 - проверка деления "//".
+    ('WLK', [2000, 1.3 / 3, 70, 1]),
+    ('WLK', [2000, 0.4333333333333333, 70, 1]),
+    ('WLK', [2000, 0.4333333333333334, 70, 1]),
+    ('WLK', [2000, 0.6500000000000001, 70, 1]),
+    ('WLK', [40000, 0.25, 110, 1]),
+    ('WLK', [1000, 3, 45, 250]),
+    ('SWM', [0, 1, 80, 25, 0]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [10 ** 6, 0.01, 80, 50, 1000]),
+    ('SWM', [100, 2, 60, 0, 10]),
+]
+
+
+@dataclass
+class Engine:
+    """
+    Движок расчета и допустимые отклонения от эталона.
+    calories_tol(package) - дополнительный абсолютный допуск калорий
+    для отдельного пакета.
+    """
+
+    name: str
+    compute: Compute
+    rel_tol: float = 0.0
+    abs_tol: float = 0.0
+    calories_tol: Optional[Callable[[Package], float]] = None
+
+
+@dataclass
+class Mismatch:
+    """Расхождение движка с эталоном."""
+
+    index: int
+    package: Package
+    field: str
+    expected: object
+    actual: object
+
+
+ENGINES: Dict[str, Engine] = {}
+
+
+def register_engine(
+        name: str,
+        rel_tol: float = 0.0,
+        abs_tol: float = 0.0,
+        calories_tol: Optional[Callable[[Package], float]] = None
+) -> Callable[[Compute], Compute]:
+    """Зарегистрировать движок; нулевые допуски - точное совпадение."""
+    def decorator(compute: Compute) -> Compute:
+        ENGINES[name] = Engine(name, compute, rel_tol, abs_tol, calories_tol)
+        return compute
+    return decorator
+
+
+def floor_step_tol(package: Package) -> float:
+    """
+    Допуск на скачок "//" у SportsWalking из оценок в batch.py:
+    если speed**2 / height почти целое, расчет может дать соседнее
+    целое, и калории отличаются на
+    CAL_WLK_SPEEDHEIGHT_COEF * weight * duration * 60.
+    """
+    workout_type, data = package
+    if workout_type != 'WLK':
+        return 0.0
+    training = read_package(workout_type, data)
+    ratio = (training.get_mean_speed() ** training.CAL_WLK_SPEED_POW
+             / training.height)
+    if abs(ratio - round(ratio)) > FLOOR_REL_TOL * max(ratio, 1.0):
+        return 0.0
+    return (training.CAL_WLK_SPEEDHEIGHT_COEF * training.weight
+            * training.duration * training.MIN_IN_H)
+
+
+def reference(packages: Sequence[Package]) -> List[InfoMessage]:
+    """Эталонный расчет по одному пакету."""
+    return [read_package(workout_type, data).show_training_info()
+            for workout_type, data in packages]
+
+
+@register_engine('batch')
+def batch_engine(packages: Sequence[Package]) -> List[InfoMessage]:
+    return compute_packages(packages)
+
+
+@register_engine('float32', rel_tol=1e-5, abs_tol=1e-3,
+                 calories_tol=floor_step_tol)
+def float32_engine(packages: Sequence[Package]) -> List[InfoMessage]:
+    """
+    Допуски взяты из оценок ошибки в batch.py, включая скачок "//"
+    у SportsWalking.
+    """
+    return compute_packages(packages, precision='float32')
+
+
+@register_engine('cache')
+def cache_engine(packages: Sequence[Package]) -> List[InfoMessage]:
+    cache = MessageCache()
+    return [cache.get(workout_type, data) for workout_type, data in packages]
+
+
+@register_engine('compact')
+def compact_engine(packages: Sequence[Package]) -> List[InfoMessage]:
+    store = TrainingStore()
+    store.extend(packages)
+    messages = {code: iter(result.to_messages())
+                for code, result in store.compute().items()}
+    return [next(messages[workout_type]) for workout_type, _ in packages]
+
+
+@register_engine('parallel')
+def parallel_engine(packages: Sequence[Package]) -> List[InfoMessage]:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        return list(iter_messages_parallel(
+            packages, workers=2, chunk_size=max(len(packages) // 8, 1),
+            executor=executor))
+
+
+def compare_messages(packages: Sequence[Package],
+                     expected: Sequence[InfoMessage],
+                     actual: Sequence[InfoMessage],
+                     rel_tol: float = 0.0,
+                     abs_tol: float = 0.0,
+                     calories_tol: Optional[Callable[[Package], float]] = None
+                     ) -> List[Mismatch]:
+    """Найти поля, отличающиеся от эталона больше допусков."""
+    if len(expected) != len(actual):
+        raise ValueError(f'Движок вернул {len(actual)} сообщений '
+                         f'вместо {len(expected)}.')
+    mismatches = []
+    for index, (package, left, right) in enumerate(
+            zip(packages, expected, actual)):
+        if left.training_type != right.training_type:
+            mismatches.append(Mismatch(index, package, 'training_type',
+                                       left.training_type,
+                                       right.training_type))
+        for field in FIELDS:
+            value, other = getattr(left, field), getattr(right, field)
+            tolerance = abs_tol
+            if field == 'calories' and calories_tol is not None:
+                tolerance += calories_tol(package)
+            if not math.isclose(value, other,
+                                rel_tol=rel_tol, abs_tol=tolerance):
+                mismatches.append(Mismatch(index, package, field,
+                                           value, other))
+    return mismatches
+
+
+def check_engine(engine: Engine,
+                 packages: Sequence[Package]) -> List[Mismatch]:
+    """Сравнить движок с эталоном на наборе пакетов."""
+    return compare_messages(packages, reference(packages),
+                            engine.compute(packages),
+                            engine.rel_tol, engine.abs_tol,
+                            engine.calories_tol)
+
+
+def run_harness(engines: Sequence[str] = tuple(ENGINES),
+                size: int = SIZE,
+                seed: int = 0,
+                repeat: int = 3) -> dict:
+    """Проверить движки и измерить ускорение по видам тренировок."""
+    packages = EDGE_PACKAGES + make_packages(size, MIXES['uniform'], seed)
+    by_type = {code: [package for package in packages
+                      if package[0] == code] for code in WORKOUT_TYPES}
+    reference_seconds = {
+        code: measure(lambda items=items: reference(items), repeat)
+        for code, items in by_type.items()}
+    report = []
+    for name in engines:
+        engine = ENGINES[name]
+        mismatches = check_engine(engine, packages)
+        timings = {}
+        for code, items in by_type.items():
+            seconds = measure(lambda items=items: engine.compute(items),
+                              repeat)
+            timings[code] = {
+                'items': len(items),
+                'reference_seconds': reference_seconds[code],
+                'seconds': seconds,
+                'speedup': reference_seconds[code] / seconds,
+            }
+        report.append({
+            'engine': name,
+            'rel_tol': engine.rel_tol,
+            'abs_tol': engine.abs_tol,
+            'calories_tol': getattr(engine.calories_tol, '__name__', None),
+            'checked': len(packages),
+            'mismatches': len(mismatches),
+            'examples': [vars(mismatch) for mismatch in mismatches[:5]],
+            'timings': timings,
+        })
+    return {'size': size, 'seed': seed, 'engines': report}
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--engines', nargs='+', choices=ENGINES,
+                        default=tuple(ENGINES))
+    parser.add_argument('--size', type=int, default=SIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', help='файл для отчета JSON')
+    args = parser.parse_args(argv)
+
+    report = run_harness(args.engines, args.size, args.seed, args.repeat)
+    for result in report['engines']:
+        speedups = ', '.join(f"{code} x{timing['speedup']:.2f}"
+                             for code, timing in result['timings'].items())
+        print(f"{result['engine']}: расхождений {result['mismatches']} "
+              f"из {result['checked']}; {speedups}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2,
+                                                default=str))
+    return 1 if any(result['mismatches']
+                    for result in report['engines']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,41 @@
+"""Сравнение форматирования через asdict и заранее разобранного шаблона.
+
+Запуск: python -m benchmarks.formatting [количество сообщений]
+"""
+import sys
+import timeit
+from dataclasses import asdict
+from io import StringIO
+
+from formatting import format_message
+from homework import InfoMessage
+
+
+def asdict_message(message: InfoMessage) -> str:
+    """Форматирование, как было до появления formatting.py."""
+    return message.MESSAGE_STRING.format(**asdict(message))
+
+
+def main(count: int = 100_000) -> None:
+    messages = [InfoMessage('Running', 1 + index / count, 9.75 * index,
+                            9.75, 699.75 + index)
+                for index in range(count)]
+    assert all(asdict_message(message) == format_message(message)
+               for message in messages)
+    cases = {
+        'asdict + format': lambda: [asdict_message(message)
+                                    for message in messages],
+        'InfoMessage.get_message': lambda: [message.get_message()
+                                            for message in messages],
+        'MessageFormatter': lambda: [format_message(message)
+                                     for message in messages],
+        'MessageFormatter.write': lambda: format_message.write(
+            messages, StringIO()),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=1, repeat=3))
+        print(f'{name:<26}{seconds / count * 1e9:>8.0f} нс/сообщение')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,85 @@
+"""Замер памяти на одну тренировку для разных представлений.
+
+Запуск: python -m benchmarks.memory [количество сессий]
+"""
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Callable, List
+
+from batch import field_names
+from compact import TrainingStore
+from homework import (InfoMessage, get_training_class,
+                      read_package)
+
+PACKAGES = [
+    ('SWM', [720, 1.5, 80.5, 25, 40]),
+    ('RUN', [15000, 1.25, 75.5]),
+    ('WLK', [9000, 1.75, 75.5, 180.5]),
+]
+
+DictInfoMessage = make_dataclass(
+    'DictInfoMessage', [field.name for field in fields(InfoMessage)])
+
+
+class DictTraining:
+    """Тренировка с атрибутами в __dict__, как до перехода на __slots__."""
+
+    def __init__(self, **attributes) -> None:
+        self.__dict__.update(attributes)
+
+
+def make_packages(count: int) -> List[tuple]:
+    """Сгенерировать пакеты с различающимися значениями."""
+    return [(workout_type, [data[0] + index, *data[1:]])
+            for index in range(count)
+            for workout_type, data in PACKAGES][:count]
+
+
+def as_dict_training(workout_type: str, data: list) -> DictTraining:
+    training_class = get_training_class(workout_type)
+    return DictTraining(**dict(zip(field_names(training_class), data)))
+
+
+def measure(build: Callable[[], object], count: int) -> float:
+    """Вернуть прирост памяти на одну сессию, байт."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return (after - before) / count
+
+
+def main(count: int = 100_000) -> None:
+    packages = make_packages(count)
+    messages = [read_package(*package).show_training_info()
+                for package in packages]
+    cases = {
+        'Training (__dict__)': lambda: [as_dict_training(*package)
+                                        for package in packages],
+        'Training (__slots__)': lambda: [read_package(*package)
+                                         for package in packages],
+        'TrainingStore (array)': lambda: _store(packages),
+        'InfoMessage (__dict__)': lambda: [
+            DictInfoMessage(*(getattr(message, field.name)
+                              for field in fields(InfoMessage)))
+            for message in messages],
+        'InfoMessage (__slots__)': lambda: [
+            InfoMessage(*(getattr(message, field.name)
+                          for field in fields(InfoMessage)))
+            for message in messages],
+    }
+    for name, build in cases.items():
+        print(f'{name:<26}{measure(build, count):>8.1f} байт/сессия')
+
+
+def _store(packages: List[tuple]) -> TrainingStore:
+    store = TrainingStore()
+    store.extend(packages)
+    return store
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
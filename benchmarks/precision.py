@@ -0,0 +1,71 @@
+"""Память, скорость и ошибка пакетного расчета при разной точности.
+
+Для каждой точности из batch.PRECISIONS пакеты складываются
+в TrainingStore и считаются пачками. Ошибка - максимальное
+отклонение калорий от расчета по одному пакету (float64).
+
+Запуск: python -m benchmarks.precision [количество сессий]
+"""
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+from batch import PRECISIONS
+from benchmarks.suite import MIXES, make_packages
+from compact import TrainingStore
+from homework import read_package
+
+
+def calories_error(store: TrainingStore,
+                   packages: List[tuple]) -> Dict[str, Dict[str, float]]:
+    """Максимальные абсолютная и относительная ошибки калорий."""
+    expected: Dict[str, List[float]] = {}
+    for workout_type, data in packages:
+        expected.setdefault(workout_type, []).append(
+            read_package(workout_type, data).get_spent_calories())
+    errors = {}
+    for workout_type, result in store.compute().items():
+        absolute = relative = 0.0
+        for value, reference in zip(result.calories,
+                                    expected[workout_type]):
+            difference = abs(float(value) - reference)
+            absolute = max(absolute, difference)
+            if reference:
+                relative = max(relative, difference / abs(reference))
+        errors[workout_type] = {'abs': absolute, 'rel': relative}
+    return errors
+
+
+def measure(packages: List[tuple], precision: str) -> dict:
+    store = TrainingStore(precision)
+    store.extend(packages)
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = store.compute()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del results
+    return {
+        'input_bytes': store.nbytes / len(packages),
+        'peak_bytes': peak / len(packages),
+        'throughput': len(packages) / seconds,
+        'errors': calories_error(store, packages),
+    }
+
+
+def main(count: int = 100_000) -> None:
+    packages = make_packages(count, MIXES['uniform'])
+    for precision in PRECISIONS:
+        result = measure(packages, precision)
+        errors = ', '.join(
+            f"{code} {error['rel']:.1e} ({error['abs']:.1e} ккал)"
+            for code, error in sorted(result['errors'].items()))
+        print(f"{precision:<8}вход {result['input_bytes']:5.1f} байт/сессия, "
+              f"пик расчета {result['peak_bytes']:6.1f} байт/сессия, "
+              f"{result['throughput']:>10.0f} сессий/с; ошибка: {errors}")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
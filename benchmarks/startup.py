@@ -0,0 +1,62 @@
+"""Время запуска командной строки для одного пакета.
+
+Запуск: python -m benchmarks.startup [количество повторов]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = 'RUN:15000,1,75'
+
+
+def timed_run(command: List[str], repeat: int,
+              env: Optional[Dict[str, str]] = None) -> float:
+    """Минимальное время выполнения команды, секунд."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, cwd=ROOT, env=env,
+                       stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def wait_for(path: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f'Сервис не создал сокет {path}.')
+        time.sleep(0.05)
+
+
+def main(repeat: int = 10) -> None:
+    python = sys.executable
+    results = {
+        'python -c pass': timed_run([python, '-c', 'pass'], repeat),
+        'homework.py': timed_run([python, 'homework.py', PACKAGE], repeat),
+        'client.py (локально)': timed_run(
+            [python, 'client.py', PACKAGE], repeat),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'homework.sock')
+        server = subprocess.Popen([python, 'service.py', '--unix', path],
+                                  cwd=ROOT, stderr=subprocess.DEVNULL)
+        try:
+            wait_for(path)
+            env = dict(os.environ, HOMEWORK_SOCKET=path)
+            results['client.py (сервис)'] = timed_run(
+                [python, 'client.py', PACKAGE], repeat, env)
+        finally:
+            server.terminate()
+            server.wait()
+    for name, seconds in results.items():
+        print(f'{name:<24}{seconds * 1000:>8.1f} мс')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
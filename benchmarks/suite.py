@@ -0,0 +1,232 @@
+"""Набор бенчмарков горячих участков homework.py.
+
+Запуск:
+    python -m benchmarks.suite --sizes 1 1000 100000 -o results.json
+    python -m benchmarks.suite --compare baseline.json results.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from itertools import cycle, islice
+from pathlib import Path
+from typing import (Any, Callable, Dict, List, NamedTuple, Optional,
+                    Sequence, Tuple)
+
+from homework import read_package
+
+SIZES: Tuple[int, ...] = (1, 1000, 100_000)
+MIXES: Dict[str, Dict[str, int]] = {
+    'uniform': {'RUN': 1, 'WLK': 1, 'SWM': 1},
+    'running': {'RUN': 8, 'WLK': 1, 'SWM': 1},
+}
+POOL_SIZE: int = 100_000
+THRESHOLD: float = 0.1
+
+Package = Tuple[str, list]
+
+
+def random_package(workout_type: str, rng: random.Random) -> Package:
+    """Сгенерировать правдоподобный пакет датчиков."""
+    duration = rng.uniform(0.25, 3)
+    weight = rng.uniform(45, 110)
+    if workout_type == 'SWM':
+        return workout_type, [rng.randint(200, 3000), duration, weight,
+                              rng.choice((25, 50)), rng.randint(10, 80)]
+    action = rng.randint(1000, 40000)
+    if workout_type == 'WLK':
+        return workout_type, [action, duration, weight,
+                              rng.uniform(150, 200)]
+    return workout_type, [action, duration, weight]
+
+
+def make_packages(size: int, mix: Dict[str, int],
+                  seed: int = 0) -> List[Package]:
+    """
+    Сгенерировать size пакетов. Больше POOL_SIZE пакетов
+    повторяются по кругу, чтобы не расходовать память.
+    """
+    rng = random.Random(seed)
+    codes = rng.choices(list(mix), weights=list(mix.values()),
+                        k=min(size, POOL_SIZE))
+    pool = [random_package(code, rng) for code in codes]
+    return list(islice(cycle(pool), size)) if size > POOL_SIZE else pool
+
+
+class Benchmark(NamedTuple):
+    """
+    Замер: run выполняется repeat раз. Если задан setup, перед каждым
+    запуском он вне замера готовит свежие данные, которые получает run.
+    """
+
+    run: Callable[..., None]
+    items: int
+    setup: Optional[Callable[[], Any]] = None
+
+
+def bench_read_package(packages: Sequence[Package]) -> Benchmark:
+    def run() -> None:
+        for workout_type, data in packages:
+            read_package(workout_type, data)
+    return Benchmark(run, len(packages))
+
+
+def bench_calories(workout_type: str):
+    def prepare(packages: Sequence[Package]) -> Benchmark:
+        selected = [package for package in packages
+                    if package[0] == workout_type]
+
+        # Тренировки кэшируют показатели, поэтому каждый повтор
+        # получает новые объекты.
+        def setup() -> list:
+            return [read_package(*package) for package in selected]
+
+        def run(trainings: list) -> None:
+            for training in trainings:
+                training.get_spent_calories()
+        return Benchmark(run, len(selected), setup)
+    return prepare
+
+
+def bench_show_training_info(packages: Sequence[Package]) -> Benchmark:
+    def setup() -> list:
+        return [read_package(*package) for package in packages]
+
+    def run(trainings: list) -> None:
+        for training in trainings:
+            training.show_training_info()
+    return Benchmark(run, len(packages), setup)
+
+
+def bench_get_message(packages: Sequence[Package]) -> Benchmark:
+    messages = [read_package(*package).show_training_info()
+                for package in packages]
+
+    def run() -> None:
+        for message in messages:
+            message.get_message()
+    return Benchmark(run, len(messages))
+
+
+def bench_pipeline(packages: Sequence[Package]) -> Benchmark:
+    def run() -> None:
+        for workout_type, data in packages:
+            read_package(workout_type, data).show_training_info().get_message()
+    return Benchmark(run, len(packages))
+
+
+BENCHMARKS: Dict[str, Callable[[Sequence[Package]], Benchmark]] = {
+    'read_package': bench_read_package,
+    'Running.get_spent_calories': bench_calories('RUN'),
+    'SportsWalking.get_spent_calories': bench_calories('WLK'),
+    'Swimming.get_spent_calories': bench_calories('SWM'),
+    'show_training_info': bench_show_training_info,
+    'InfoMessage.get_message': bench_get_message,
+    'pipeline': bench_pipeline,
+}
+
+
+def measure(run: Callable[..., None],
+            repeat: int,
+            setup: Optional[Callable[[], Any]] = None) -> float:
+    """Минимальное время из repeat запусков, секунд."""
+    best = float('inf')
+    for _ in range(repeat):
+        arguments = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        run(*arguments)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(sizes: Sequence[int] = SIZES,
+              mixes: Sequence[str] = tuple(MIXES),
+              names: Sequence[str] = tuple(BENCHMARKS),
+              repeat: int = 3,
+              seed: int = 0) -> dict:
+    """Выполнить бенчмарки и вернуть результаты для JSON."""
+    results = []
+    for mix in mixes:
+        for size in sizes:
+            packages = make_packages(size, MIXES[mix], seed)
+            for name in names:
+                bench, items, setup = BENCHMARKS[name](packages)
+                seconds = measure(bench, repeat, setup)
+                results.append({
+                    'benchmark': name,
+                    'mix': mix,
+                    'size': size,
+                    'items': items,
+                    'seconds': seconds,
+                    'ns_per_item': seconds / items * 1e9 if items else None,
+                })
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'timestamp': time.time(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict,
+            threshold: float = THRESHOLD) -> List[dict]:
+    """Найти бенчмарки, замедлившиеся больше чем на threshold."""
+    def key(result: dict) -> Tuple[str, str, int]:
+        return result['benchmark'], result['mix'], result['size']
+
+    previous = {key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get(key(result))
+        if not old or not old['ns_per_item'] or not result['ns_per_item']:
+            continue
+        ratio = result['ns_per_item'] / old['ns_per_item']
+        if ratio > 1 + threshold:
+            regressions.append({**result, 'ratio': ratio})
+    return regressions
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--mixes', nargs='+', choices=MIXES,
+                        default=tuple(MIXES))
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS,
+                        default=tuple(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='файл для результатов JSON')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='сравнить два файла результатов')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, current = (json.loads(Path(path).read_text())
+                             for path in args.compare)
+        regressions = compare(baseline, current, args.threshold)
+        for result in regressions:
+            print(f"{result['benchmark']} [{result['mix']}, "
+                  f"{result['size']}]: x{result['ratio']:.2f}")
+        return 1 if regressions else 0
+
+    report = run_suite(args.sizes, args.mixes, args.benchmarks,
+                       args.repeat, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
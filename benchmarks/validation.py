@@ -0,0 +1,55 @@
+"""Накладные расходы проверки пакетов перед расчетом.
+
+Запуск: python -m benchmarks.validation [размер пачки]
+"""
+import sys
+import time
+
+from batch import compute_batch, group_packages
+from benchmarks.suite import MIXES, make_packages
+from homework import read_package
+from validation import (Quarantine, filter_columns,
+                        filter_packages)
+
+
+def timed(function, repeat: int = 3) -> float:
+    """Минимальное время из repeat запусков, секунд."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(size: int = 1_000_000) -> None:
+    packages = make_packages(size, MIXES['uniform'])
+    groups = group_packages(packages)
+
+    def scalar() -> None:
+        for workout_type, data in packages:
+            read_package(workout_type, data).show_training_info()
+
+    def scalar_checked() -> None:
+        for workout_type, data in filter_packages(packages, Quarantine()):
+            read_package(workout_type, data).show_training_info()
+
+    def columns() -> None:
+        for workout_type, group in groups.items():
+            compute_batch(workout_type, group)
+
+    def columns_checked() -> None:
+        quarantine = Quarantine()
+        for workout_type, group in groups.items():
+            compute_batch(workout_type,
+                          filter_columns(workout_type, group, quarantine))
+
+    for name, plain, checked in (('построчно', scalar, scalar_checked),
+                                 ('колонками', columns, columns_checked)):
+        base, with_check = timed(plain), timed(checked)
+        print(f'{name:<10} {base:8.3f} с -> {with_check:8.3f} с '
+              f'({(with_check / base - 1) * 100:+.1f}%)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
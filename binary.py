@@ -0,0 +1,158 @@
+"""Двоичный формат пакетов датчиков.
+
+Кадр состоит из кода тренировки и значений полей без выравнивания,
+порядок байт little-endian. Код занимает 4 байта ASCII и дополняется
+нулевыми байтами. Целые поля (аннотированные int) - int64, остальные
+- float64:
+
+    RUN: code[4] action:q duration:d weight:d                    (28 байт)
+    WLK: code[4] action:q duration:d weight:d height:d           (36 байт)
+    SWM: code[4] action:q duration:d weight:d length_pool:d
+         count_pool:q                                            (44 байт)
+
+Однородный файл (колонки одного кода) хранит кадры без поля code.
+"""
+import mmap
+import struct
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Sequence, Tuple
+
+from batch import BatchResult, complete_row, compute_batch
+from compact import TrainingStore, column_typecodes
+from homework import get_training_class
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость.
+    np = None
+
+CODE_SIZE: int = 4
+BYTE_ORDER: str = '<'
+
+_STRUCTS: Dict[str, struct.Struct] = {}
+
+
+def payload_struct(workout_type: str) -> struct.Struct:
+    """Получить структуру значений кадра для кода тренировки."""
+    if workout_type not in _STRUCTS:
+        typecodes = column_typecodes(get_training_class(workout_type))
+        _STRUCTS[workout_type] = struct.Struct(
+            BYTE_ORDER + ''.join(typecodes.values()))
+    return _STRUCTS[workout_type]
+
+
+def encode_code(workout_type: str) -> bytes:
+    """Закодировать код тренировки в CODE_SIZE байт."""
+    code = workout_type.encode('ascii')
+    if len(code) > CODE_SIZE:
+        raise ValueError(f'Код тренировки длиннее {CODE_SIZE} байт: '
+                         f'{workout_type}')
+    return code.ljust(CODE_SIZE, b'\0')
+
+
+def payload_values(workout_type: str, data: Sequence) -> Sequence:
+    """Дополнить данные пакета значениями необязательных полей."""
+    fields = len(payload_struct(workout_type).format) - len(BYTE_ORDER)
+    if len(data) == fields:
+        return data
+    return complete_row(get_training_class(workout_type), data)
+
+
+def encode_frame(workout_type: str, data: Sequence) -> bytes:
+    """Закодировать пакет в кадр с кодом тренировки."""
+    return (encode_code(workout_type)
+            + payload_struct(workout_type).pack(
+                *payload_values(workout_type, data)))
+
+
+def encode_frames(packages: Iterable[Tuple[str, Sequence]]) -> bytes:
+    """Закодировать пакеты в последовательность кадров."""
+    return b''.join(encode_frame(workout_type, data)
+                    for workout_type, data in packages)
+
+
+def iter_frames(buffer) -> Iterator[Tuple[str, tuple]]:
+    """
+    Прочитать кадры разных кодов из буфера без копирования.
+    Возвращает пары (код, значения), пригодные для read_package.
+    """
+    view = memoryview(buffer)
+    offset, size = 0, len(view)
+    codes: Dict[bytes, Tuple[str, struct.Struct]] = {}
+    while offset < size:
+        raw_code = bytes(view[offset:offset + CODE_SIZE])
+        if raw_code not in codes:
+            workout_type = raw_code.rstrip(b'\0').decode('ascii')
+            codes[raw_code] = workout_type, payload_struct(workout_type)
+        workout_type, payload = codes[raw_code]
+        offset += CODE_SIZE
+        if offset + payload.size > size:
+            raise ValueError(f'Обрезанный кадр {workout_type} '
+                             f'на смещении {offset - CODE_SIZE}.')
+        yield workout_type, payload.unpack_from(view, offset)
+        offset += payload.size
+
+
+def decode_store(buffer) -> TrainingStore:
+    """Разложить кадры разных кодов по колонкам TrainingStore."""
+    store = TrainingStore()
+    store.extend(iter_frames(buffer))
+    return store
+
+
+def encode_columns(workout_type: str, rows: Iterable[Sequence]) -> bytes:
+    """Закодировать пакеты одного кода в однородный файл."""
+    payload = payload_struct(workout_type)
+    return b''.join(payload.pack(*payload_values(workout_type, data))
+                    for data in rows)
+
+
+def decode_columns(workout_type: str, buffer) -> Dict[str, Sequence]:
+    """
+    Прочитать однородный буфер как колонки.
+    С numpy колонки - представления над буфером без копирования.
+    """
+    typecodes = column_typecodes(get_training_class(workout_type))
+    payload = payload_struct(workout_type)
+    if len(buffer) % payload.size:
+        raise ValueError(f'Размер буфера не кратен кадру {workout_type} '
+                         f'({payload.size} байт).')
+    if np is not None:
+        dtype = np.dtype([(name, BYTE_ORDER + typecode)
+                          for name, typecode in typecodes.items()])
+        records = np.frombuffer(buffer, dtype=dtype)
+        return {name: records[name] for name in typecodes}
+    columns = list(zip(*payload.iter_unpack(buffer)))
+    if not columns:
+        return {name: () for name in typecodes}
+    return dict(zip(typecodes, columns))
+
+
+def compute_columns_file(workout_type: str, path: str) -> BatchResult:
+    """Рассчитать показатели для однородного файла через mmap."""
+    with open_mapped(path) as buffer:
+        return compute_batch(workout_type,
+                             decode_columns(workout_type, buffer))
+
+
+@contextmanager
+def open_mapped(path: str) -> Iterator[memoryview]:
+    """
+    Отобразить файл в память только для чтения. Если после выхода
+    из блока на буфер еще ссылаются колонки decode_columns, отображение
+    закрывается вместе с последней из них.
+    """
+    with open(path, 'rb') as file:
+        if not file.seek(0, 2):
+            yield memoryview(b'')
+            return
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        try:
+            view.release()
+            mapped.close()
+        except BufferError:
+            pass
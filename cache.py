@@ -0,0 +1,204 @@
+"""Кэши результатов расчета: по пакету и по идентификатору сессии."""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+from homework import InfoMessage, read_package
+
+MAXSIZE: int = 65536
+
+
+@dataclass
+class CacheStats:
+    """Статистика работы кэша."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    expired: int = 0
+
+
+def package_key(workout_type: str, data: Sequence) -> Tuple[Hashable, ...]:
+    """
+    Нормализовать пакет в ключ кэша. 1 и 1.0 дают одинаковый ключ
+    и одинаковый результат расчета.
+    """
+    return (workout_type, *data)
+
+
+class MessageCache:
+    """
+    LRU-кэш сообщений по нормализованному пакету.
+    Возвращает общий объект InfoMessage, менять его нельзя.
+    """
+
+    def __init__(self, maxsize: int = MAXSIZE, enabled: bool = True) -> None:
+        self._lock = threading.Lock()
+        self._data: 'OrderedDict[tuple, InfoMessage]' = OrderedDict()
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, workout_type: str, data: Sequence) -> InfoMessage:
+        """Получить сообщение из кэша или рассчитать его."""
+        if not self.enabled or self.maxsize <= 0:
+            return read_package(workout_type, data).show_training_info()
+        key = package_key(workout_type, data)
+        with self._lock:
+            message = self._data.get(key)
+            if message is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return message
+            self.misses += 1
+        message = read_package(workout_type, data).show_training_info()
+        with self._lock:
+            self._data[key] = message
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return message
+
+    def configure(self,
+                  maxsize: Optional[int] = None,
+                  enabled: Optional[bool] = None) -> None:
+        """Изменить размер кэша или включить/выключить его."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+                while len(self._data) > max(maxsize, 0):
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+            if enabled is not None:
+                self.enabled = enabled
+
+    def clear(self) -> None:
+        """Очистить кэш и статистику."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions,
+                              len(self._data), self.maxsize)
+
+
+message_cache = MessageCache()
+
+
+def cached_training_info(workout_type: str, data: Sequence) -> InfoMessage:
+    """Рассчитать пакет через общий кэш процесса."""
+    return message_cache.get(workout_type, data)
+
+
+class _Stripe:
+    """Часть SessionStore со своей блокировкой."""
+
+    __slots__ = ('lock', 'data', 'maxsize', 'hits', 'misses', 'evictions',
+                 'expired')
+
+    def __init__(self, maxsize: int) -> None:
+        self.lock = threading.Lock()
+        self.maxsize = maxsize
+        self.data: 'OrderedDict[Hashable, Tuple[float, InfoMessage]]' = (
+            OrderedDict())
+        self.hits = self.misses = self.evictions = self.expired = 0
+
+
+class SessionStore:
+    """
+    Потокобезопасное хранилище сообщений по идентификатору сессии
+    с ограничением размера (LRU) и временем жизни записей.
+    Ключи распределены по полосам, у каждой полосы своя блокировка,
+    поэтому потоки с разными сессиями почти не ждут друг друга.
+    Ограничение размера и порядок LRU действуют внутри полосы.
+    """
+
+    def __init__(self,
+                 maxsize: int = MAXSIZE,
+                 ttl: Optional[float] = None,
+                 stripes: int = 16,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if maxsize < 1 or stripes < 1:
+            raise ValueError('Размер и число полос должны быть больше нуля.')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        # Размеры полос в сумме дают ровно maxsize: остаток
+        # достается первым maxsize % stripes полосам.
+        stripes = min(stripes, maxsize)
+        size, extra = divmod(maxsize, stripes)
+        self._stripes: List[_Stripe] = [_Stripe(size + (index < extra))
+                                        for index in range(stripes)]
+
+    def _stripe(self, session_id: Hashable) -> _Stripe:
+        return self._stripes[hash(session_id) % len(self._stripes)]
+
+    def get(self, session_id: Hashable) -> Optional[InfoMessage]:
+        """Получить сообщение сессии или None."""
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            entry = stripe.data.get(session_id)
+            if entry is not None:
+                expires, message = entry
+                if expires >= self.clock():
+                    stripe.data.move_to_end(session_id)
+                    stripe.hits += 1
+                    return message
+                del stripe.data[session_id]
+                stripe.expired += 1
+            stripe.misses += 1
+            return None
+
+    def put(self, session_id: Hashable, message: InfoMessage) -> None:
+        """Сохранить сообщение сессии."""
+        expires = (self.clock() + self.ttl if self.ttl is not None
+                   else float('inf'))
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            stripe.data[session_id] = (expires, message)
+            stripe.data.move_to_end(session_id)
+            while len(stripe.data) > stripe.maxsize:
+                stripe.data.popitem(last=False)
+                stripe.evictions += 1
+
+    def get_or_compute(self,
+                       session_id: Hashable,
+                       workout_type: str,
+                       data: Sequence) -> InfoMessage:
+        """
+        Получить сообщение сессии, при промахе рассчитать и сохранить.
+        Расчет идет вне блокировки: при одновременном промахе по одной
+        сессии результат может быть рассчитан дважды, но он одинаков.
+        """
+        message = self.get(session_id)
+        if message is None:
+            message = read_package(workout_type, data).show_training_info()
+            self.put(session_id, message)
+        return message
+
+    def invalidate(self, session_id: Hashable) -> None:
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            stripe.data.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return sum(len(stripe.data) for stripe in self._stripes)
+
+    def stats(self) -> CacheStats:
+        stats = CacheStats(0, 0, 0, 0, self.maxsize)
+        for stripe in self._stripes:
+            with stripe.lock:
+                stats.hits += stripe.hits
+                stats.misses += stripe.misses
+                stats.evictions += stripe.evictions
+                stats.expired += stripe.expired
+                stats.size += len(stripe.data)
+        return stats
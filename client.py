@@ -0,0 +1,81 @@
+"""Легкий клиент командной строки для прогретого сервиса.
+
+Запуск: python client.py [--socket PATH] RUN:15000,1,75 ...
+Путь к Unix-сокету service.py берется из --socket или переменной
+HOMEWORK_SOCKET. Если сервис недоступен, пакеты считаются локально.
+Модуль импортирует только sys, os и socket (даже не typing),
+чтобы запуск был быстрым.
+"""
+import os
+import socket
+import sys
+
+SOCKET_ENV: str = 'HOMEWORK_SOCKET'
+TIMEOUT: float = 5.0
+
+
+def request(path: str, arguments: list) -> list:
+    """Отправить пакеты сервису и получить строки ответов."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(TIMEOUT)
+        client.connect(path)
+        client.sendall(''.join(argument + '\n'
+                               for argument in arguments).encode())
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        chunk = client.recv(65536)
+        while chunk:
+            chunks.append(chunk)
+            chunk = client.recv(65536)
+    return b''.join(chunks).decode().splitlines()
+
+
+def run_remote(path: str, arguments: list) -> int:
+    """Посчитать пакеты в сервисе и напечатать сообщения."""
+    import json
+
+    status = 0
+    for line in request(path, arguments):
+        reply = json.loads(line)
+        if 'error' in reply:
+            print(reply['error'], file=sys.stderr)
+            status = 1
+        else:
+            print(reply['message'])
+    return status
+
+
+def run_local(arguments: list) -> int:
+    """Посчитать пакеты в текущем процессе."""
+    from homework import main, parse_argument, read_package
+
+    for argument in arguments:
+        main(read_package(*parse_argument(argument)))
+    return 0
+
+
+def run(argv: list = None) -> int:
+    """Точка входа командной строки."""
+    arguments = list(sys.argv[1:] if argv is None else argv)
+    path = os.environ.get(SOCKET_ENV)
+    if arguments[:1] == ['--socket']:
+        if len(arguments) < 2:
+            print('После --socket нужно указать путь к сокету.',
+                  file=sys.stderr)
+            return 1
+        path, arguments = arguments[1], arguments[2:]
+    try:
+        if path:
+            try:
+                return run_remote(path, arguments)
+            except OSError:
+                pass
+        return run_local(arguments)
+    except (KeyError, TypeError, ValueError, IndexError,
+            ZeroDivisionError) as error:
+        print(f'{type(error).__name__}: {error}', file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(run())
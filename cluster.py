@@ -0,0 +1,322 @@
+"""Распределенный расчет: координатор и процессы-обработчики.
+
+Координатор делит пакеты на шарды по хэшу спортсмена, собирает их
+в порции и отправляет обработчикам через Unix-сокеты
+(multiprocessing.connection). Все пакеты спортсмена попадают к одному
+обработчику. Если обработчик упал или не ответил вовремя, он
+перезапускается, а порция отправляется повторно. Результаты
+возвращаются в порядке входных пакетов.
+
+Запуск: python cluster.py packages.jsonl -w 4
+В записях JSON Lines спортсмен задается полем "athlete".
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from batch import compute_packages
+from formatting import format_message
+from homework import InfoMessage
+from stream import Package, package_from_record
+
+CHUNK_SIZE: int = 1000
+TIMEOUT: float = 30.0
+RETRIES: int = 3
+CONNECT_TIMEOUT: float = 10.0
+
+ShardedPackage = Tuple[Any, Package]
+_Chunk = Tuple[List[int], List[Package]]
+
+
+class ClusterError(RuntimeError):
+    """Порцию не удалось посчитать за отведенное число попыток."""
+
+
+@dataclass
+class ClusterStats:
+    """Итоги распределенного расчета."""
+
+    packages: int = 0
+    chunks: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Пакетов в секунду."""
+        return self.packages / self.seconds if self.seconds else 0.0
+
+
+def shard_of(athlete: Any, shards: int) -> int:
+    """Номер шарда спортсмена, одинаковый во всех процессах."""
+    return zlib.crc32(str(athlete).encode()) % shards
+
+
+def serve_worker(address: str, authkey: bytes) -> None:
+    """Цикл процесса-обработчика: принимать порции и считать их."""
+    with Listener(address, 'AF_UNIX', authkey=authkey) as listener:
+        while True:
+            with listener.accept() as connection:
+                while True:
+                    try:
+                        packages = connection.recv()
+                    except EOFError:
+                        break
+                    if packages is None:
+                        return
+                    try:
+                        reply = ('ok', compute_packages(packages))
+                    except Exception as error:
+                        reply = ('error', error)
+                    connection.send(reply)
+
+
+def _connect(address: str, authkey: bytes, timeout: float) -> Connection:
+    """Подключиться к обработчику, дождавшись его запуска."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(address, 'AF_UNIX', authkey=authkey)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+class _Worker:
+    """Процесс-обработчик и соединение с ним."""
+
+    def __init__(self, context, address: str, authkey: bytes) -> None:
+        self.context = context
+        self.address = address
+        self.authkey = authkey
+        self.process = None
+        self.connection: Optional[Connection] = None
+
+    def start(self) -> None:
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        self.process = self.context.Process(
+            target=serve_worker, args=(self.address, self.authkey),
+            daemon=True)
+        self.process.start()
+        self.connection = _connect(self.address, self.authkey,
+                                   CONNECT_TIMEOUT)
+
+    def restart(self) -> None:
+        self.stop(force=True)
+        self.start()
+
+    def compute(self,
+                packages: Sequence[Package],
+                timeout: float) -> List[InfoMessage]:
+        """Посчитать порцию, ошибки связи - OSError или EOFError."""
+        self.connection.send(packages)
+        if not self.connection.poll(timeout):
+            raise TimeoutError('Обработчик не ответил вовремя.')
+        status, result = self.connection.recv()
+        if status == 'error':
+            raise result
+        return result
+
+    def stop(self, force: bool = False) -> None:
+        if self.connection is not None:
+            if not force:
+                try:
+                    self.connection.send(None)
+                except OSError:
+                    pass
+            self.connection.close()
+            self.connection = None
+        if self.process is not None:
+            if force:
+                self.process.kill()
+            self.process.join(CONNECT_TIMEOUT)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+            self.process = None
+
+
+class Coordinator:
+    """Координатор локального кластера обработчиков."""
+
+    def __init__(self,
+                 workers: int = 2,
+                 chunk_size: int = CHUNK_SIZE,
+                 retries: int = RETRIES,
+                 timeout: float = TIMEOUT) -> None:
+        if workers < 1 or chunk_size < 1:
+            raise ValueError('Число обработчиков и размер порции '
+                             'должны быть положительными.')
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._directory = tempfile.TemporaryDirectory(prefix='homework-')
+        authkey = os.urandom(16)
+        context = multiprocessing.get_context('spawn')
+        self.workers = [
+            _Worker(context,
+                    os.path.join(self._directory.name, f'worker-{index}'),
+                    authkey)
+            for index in range(workers)
+        ]
+
+    def start(self) -> 'Coordinator':
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    def close(self) -> None:
+        for worker in self.workers:
+            worker.stop()
+        self._directory.cleanup()
+
+    def __enter__(self) -> 'Coordinator':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _compute_chunk(self,
+                       worker: _Worker,
+                       packages: Sequence[Package],
+                       stats: ClusterStats) -> List[InfoMessage]:
+        """Посчитать порцию, перезапуская обработчик при сбоях."""
+        for attempt in range(self.retries + 1):
+            try:
+                return worker.compute(packages, self.timeout)
+            except (OSError, EOFError) as error:
+                if attempt == self.retries:
+                    raise ClusterError(f'Порция не посчитана за '
+                                       f'{attempt + 1} попыток: {error}'
+                                       ) from error
+                with self._lock:
+                    stats.retries += 1
+                worker.restart()
+
+    def _serve(self,
+               worker: _Worker,
+               chunks: 'queue.Queue[Optional[_Chunk]]',
+               results: List[Optional[InfoMessage]],
+               stats: ClusterStats,
+               errors: List[BaseException]) -> None:
+        """Отправлять порции шарда одному обработчику."""
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            if errors:
+                continue
+            indexes, packages = chunk
+            try:
+                messages = self._compute_chunk(worker, packages, stats)
+            except Exception as error:
+                errors.append(error)
+                continue
+            for index, message in zip(indexes, messages):
+                results[index] = message
+
+    def compute(self, items: Iterable[ShardedPackage]
+                ) -> Tuple[List[InfoMessage], ClusterStats]:
+        """
+        Посчитать пакеты (спортсмен, пакет) на обработчиках.
+        Вернуть сообщения в порядке входа и статистику.
+        """
+        started = time.perf_counter()
+        stats = ClusterStats()
+        results: List[Optional[InfoMessage]] = []
+        errors: List[BaseException] = []
+        queues = [queue.Queue(2) for _ in self.workers]
+        threads = [
+            threading.Thread(target=self._serve,
+                             args=(worker, chunks, results, stats, errors),
+                             daemon=True)
+            for worker, chunks in zip(self.workers, queues)
+        ]
+        for thread in threads:
+            thread.start()
+        buffers: List[_Chunk] = [([], []) for _ in self.workers]
+        try:
+            for athlete, package in items:
+                shard = shard_of(athlete, len(self.workers))
+                indexes, packages = buffers[shard]
+                indexes.append(len(results))
+                packages.append(package)
+                results.append(None)
+                if len(packages) >= self.chunk_size:
+                    queues[shard].put(buffers[shard])
+                    buffers[shard] = ([], [])
+                    stats.chunks += 1
+            for shard, (indexes, packages) in enumerate(buffers):
+                if packages:
+                    queues[shard].put((indexes, packages))
+                    stats.chunks += 1
+        finally:
+            for chunks in queues:
+                chunks.put(None)
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+        stats.packages = len(results)
+        stats.seconds = time.perf_counter() - started
+        return results, stats
+
+
+def parse_sharded(lines: Iterable[str]) -> Iterable[ShardedPackage]:
+    """
+    Прочитать JSON Lines с полем "athlete".
+    Для записей без спортсмена ключом шарда служит номер строки.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        athlete = (record.get('athlete', number)
+                   if isinstance(record, dict) else number)
+        yield athlete, package_from_record(record)
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Распределенный расчет пакетов на локальном кластере.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='файл JSON Lines, по умолчанию stdin')
+    parser.add_argument('-w', '--workers', type=int, default=2,
+                        help='количество процессов-обработчиков')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--retries', type=int, default=RETRIES)
+    parser.add_argument('--timeout', type=float, default=TIMEOUT,
+                        help='время ожидания ответа на порцию, секунд')
+    args = parser.parse_args(argv)
+    source = (sys.stdin if args.input == '-'
+              else open(args.input, encoding='utf-8'))
+    try:
+        with Coordinator(args.workers, args.chunk_size, args.retries,
+                         args.timeout) as coordinator:
+            messages, stats = coordinator.compute(parse_sharded(source))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    format_message.write(messages, sys.stdout)
+    print(f'Пакетов: {stats.packages}, порций: {stats.chunks}, '
+          f'повторов: {stats.retries}, '
+          f'{stats.throughput:.0f} пакетов/с', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
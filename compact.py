@@ -0,0 +1,113 @@
+"""Компактное хранение большого числа тренировок в типизированных массивах."""
+from array import array
+from typing import Dict, Iterable, Iterator, Sequence, Type, get_type_hints
+
+from batch import (BatchResult, complete_row, compute_columns, field_names,
+                   float_typecode)
+from homework import Training, get_training_class
+
+INT_TYPECODE: str = 'q'
+FLOAT_TYPECODE: str = 'd'
+# В режиме float32 целые колонки хранятся в 4-байтовом int.
+INT_TYPECODES: Dict[str, str] = {'float64': INT_TYPECODE, 'float32': 'i'}
+
+
+def column_typecodes(training_class: Type[Training],
+                     precision: str = 'float64') -> Dict[str, str]:
+    """Получить коды типов массивов по аннотациям __init__."""
+    hints = get_type_hints(training_class.__init__)
+    float_code = float_typecode(precision)
+    int_code = INT_TYPECODES[precision]
+    return {name: int_code if hints.get(name) is int else float_code
+            for name in field_names(training_class)}
+
+
+class TrainingArray:
+    """Тренировки одного типа, хранящиеся по колонкам."""
+
+    __slots__ = ('training_class', 'columns', 'precision')
+
+    def __init__(self,
+                 training_class: Type[Training],
+                 rows: Iterable[Sequence] = (),
+                 precision: str = 'float64') -> None:
+        self.training_class = training_class
+        self.precision = precision
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, typecode
+            in column_typecodes(training_class, precision).items()
+        }
+        self.extend(rows)
+
+    def append(self, data: Sequence) -> None:
+        """Добавить одну тренировку; необязательные значения можно опустить."""
+        if len(data) != len(self.columns):
+            data = complete_row(self.training_class, data)
+        for column, value in zip(self.columns.values(), data):
+            column.append(value)
+
+    def extend(self, rows: Iterable[Sequence]) -> None:
+        """Добавить несколько тренировок."""
+        for data in rows:
+            self.append(data)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, index: int) -> Training:
+        """Получить объект тренировки для строки index."""
+        return self.training_class(*(column[index]
+                                     for column in self.columns.values()))
+
+    def __iter__(self) -> Iterator[Training]:
+        for row in zip(*self.columns.values()):
+            yield self.training_class(*row)
+
+    @property
+    def nbytes(self) -> int:
+        """Объем данных в колонках, байт."""
+        return sum(column.itemsize * len(column)
+                   for column in self.columns.values())
+
+    def compute(self) -> BatchResult:
+        """Рассчитать показатели всех тренировок пачкой."""
+        return compute_columns(self.training_class, self.columns,
+                               self.precision)
+
+
+class TrainingStore:
+    """Хранилище тренировок разных типов, сгруппированных по коду."""
+
+    __slots__ = ('arrays', 'precision')
+
+    def __init__(self, precision: str = 'float64') -> None:
+        float_typecode(precision)
+        self.arrays: Dict[str, TrainingArray] = {}
+        self.precision = precision
+
+    def append(self, workout_type: str, data: Sequence) -> None:
+        """Добавить тренировку по коду и данным пакета."""
+        if workout_type not in self.arrays:
+            self.arrays[workout_type] = TrainingArray(
+                get_training_class(workout_type), precision=self.precision)
+        self.arrays[workout_type].append(data)
+
+    def extend(self, packages: Iterable[Sequence]) -> None:
+        """Добавить пакеты вида (код, данные)."""
+        for workout_type, data in packages:
+            self.append(workout_type, data)
+
+    def __len__(self) -> int:
+        return sum(len(training_array)
+                   for training_array in self.arrays.values())
+
+    @property
+    def nbytes(self) -> int:
+        """Объем данных во всех колонках, байт."""
+        return sum(training_array.nbytes
+                   for training_array in self.arrays.values())
+
+    def compute(self) -> Dict[str, BatchResult]:
+        """Рассчитать показатели по каждому коду тренировки."""
+        return {workout_type: training_array.compute()
+                for workout_type, training_array in self.arrays.items()}
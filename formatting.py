@@ -0,0 +1,87 @@
+"""Быстрое форматирование сообщений о тренировках."""
+from operator import attrgetter
+from string import Formatter
+from typing import IO, Callable, Iterable, List, Sequence, Tuple
+
+from homework import InfoMessage
+
+CHUNK_SIZE: int = 4096
+
+
+def compile_template(template: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Заменить именованные поля шаблона позиционными.
+    Вернуть новый шаблон и имена полей в порядке подстановки.
+    """
+    parts: List[str] = []
+    names: List[str] = []
+    for literal, name, spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if name is None:
+            continue
+        field = str(len(names))
+        if conversion:
+            field += '!' + conversion
+        if spec:
+            field += ':' + spec
+        parts.append('{' + field + '}')
+        names.append(name)
+    return ''.join(parts), tuple(names)
+
+
+class MessageFormatter:
+    """Форматтер, заранее разобравший шаблон сообщения."""
+
+    __slots__ = ('template', 'names', '_format', '_getter')
+
+    def __init__(self, template: str = InfoMessage.MESSAGE_STRING) -> None:
+        self.template, self.names = compile_template(template)
+        self._format: Callable[..., str] = self.template.format
+        getter = attrgetter(*self.names)
+        if len(self.names) == 1:
+            self._getter = lambda message: (getter(message),)
+        else:
+            self._getter = getter
+
+    def __call__(self, message: InfoMessage) -> str:
+        """Отформатировать одно сообщение."""
+        return self._format(*self._getter(message))
+
+    def format_fields(self, **fields) -> str:
+        """Отформатировать сообщение по значениям полей."""
+        return self._format(*(fields[name] for name in self.names))
+
+    def render(self, messages: Iterable[InfoMessage]) -> str:
+        """Отформатировать сообщения в одну строку, по строке на каждое."""
+        return ''.join([self(message) + '\n' for message in messages])
+
+    def render_rows(self, rows: Iterable[Sequence]) -> str:
+        """
+        Отформатировать строки значений, упорядоченных как
+        поля InfoMessage, без создания объектов InfoMessage.
+        """
+        order = [InfoMessage.__slots__.index(name) for name in self.names]
+        template = self.template + '\n'
+        return ''.join([template.format(*[row[i] for i in order])
+                        for row in rows])
+
+    def write(self,
+              messages: Iterable[InfoMessage],
+              target: IO[str],
+              chunk_size: int = CHUNK_SIZE) -> int:
+        """Записать сообщения в файл порциями по chunk_size строк."""
+        count = 0
+        chunk: List[str] = []
+        for message in messages:
+            chunk.append(self(message))
+            if len(chunk) >= chunk_size:
+                target.write('\n'.join(chunk) + '\n')
+                count += len(chunk)
+                chunk.clear()
+        if chunk:
+            target.write('\n'.join(chunk) + '\n')
+            count += len(chunk)
+        return count
+
+
+format_message = MessageFormatter()
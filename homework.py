@@ -1,34 +1,57 @@
-from dataclasses import dataclass, asdict
-from typing import Dict, Type
+import inspect
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Callable, ClassVar, Dict, Tuple, Type, TypeVar
+
+PLUGIN_GROUP: str = 'homework.trainings'
 
 
 @dataclass
 class InfoMessage:
     """Информационное сообщение о тренировке."""
 
+    __slots__ = ('training_type', 'duration', 'distance', 'speed',
+                 'calories')
+
     training_type: str
     duration: float
     distance: float
     speed: float
     calories: float
 
-    MESSAGE_STRING: str = ("Тип тренировки: {training_type}; "
-                           "Длительность: {duration:.3f} ч.; "
-                           "Дистанция: {distance:.3f} км; "
-                           "Ср. скорость: {speed:.3f} км/ч; "
-                           "Потрачено ккал: {calories:.3f}.")
+    MESSAGE_STRING: ClassVar[str] = ("Тип тренировки: {training_type}; "
+                                     "Длительность: {duration:.3f} ч.; "
+                                     "Дистанция: {distance:.3f} км; "
+                                     "Ср. скорость: {speed:.3f} км/ч; "
+                                     "Потрачено ккал: {calories:.3f}.")
 
     def get_message(self) -> str:
         """
         Функция для получения строкового
         представления объекта InfoMessage.
         """
-        return self.MESSAGE_STRING.format(**asdict(self))
+        return self.MESSAGE_STRING.format(
+            **{name: getattr(self, name) for name in self.__slots__})
+
+
+def _read_only(name: str) -> property:
+    """Входное значение тренировки, доступное только для чтения."""
+    return property(attrgetter('_' + name))
 
 
 class Training:
     """Базовый класс тренировки."""
 
+    # __dict__ создается только при записи посторонних атрибутов.
+    # _distance и _speed кэшируют показатели, поэтому входные данные,
+    # от которых они зависят, после создания менять нельзя.
+    __slots__ = ('_action', '_duration', '_weight',
+                 '_distance', '_speed', '__dict__')
+
+    action = _read_only('action')
+    duration = _read_only('duration')
+    weight = _read_only('weight')
+
     LEN_STEP: float = 0.65
     M_IN_KM: float = 1000
     MIN_IN_H: float = 60
@@ -37,17 +60,23 @@ class Training:
                  action: int,
                  duration: float,
                  weight: float) -> None:
-        self.action = action
-        self.duration = duration
-        self.weight = weight
+        self._action = action
+        self._duration = duration
+        self._weight = weight
+        self._distance = None
+        self._speed = None
 
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
-        return self.action * self.LEN_STEP / self.M_IN_KM
+        if self._distance is None:
+            self._distance = self.action * self.LEN_STEP / self.M_IN_KM
+        return self._distance
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        return self.get_distance() / self.duration
+        if self._speed is None:
+            self._speed = self.get_distance() / self.duration
+        return self._speed
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
@@ -63,9 +92,59 @@ class Training:
                            self.get_spent_calories())
 
 
+_TRAINING_DICT: Dict[str, Type[Training]] = {}
+_TRAINING_ARITY: Dict[str, Tuple[int, int]] = {}
+
+TrainingType = TypeVar('TrainingType', bound=Type[Training])
+
+
+def _get_arity(training_class: Type[Training]) -> Tuple[int, int]:
+    """
+    Получить минимальное и максимальное число значений пакета.
+    Пакет передается позиционно, поэтому *args и обязательные
+    именованные параметры запрещены.
+    """
+    name = training_class.__name__
+    low = high = 0
+    parameters = inspect.signature(training_class.__init__).parameters
+    for parameter in list(parameters.values())[1:]:
+        if parameter.kind is parameter.VAR_POSITIONAL:
+            raise TypeError(f'{name} должен принимать '
+                            'фиксированный набор значений.')
+        if parameter.kind is parameter.KEYWORD_ONLY:
+            if parameter.default is parameter.empty:
+                raise TypeError(f'{name} не должен требовать именованный '
+                                f'параметр {parameter.name}.')
+        elif parameter.kind is not parameter.VAR_KEYWORD:
+            high += 1
+            low += parameter.default is parameter.empty
+    return low, high
+
+
+def register_training(
+        workout_type: str
+) -> Callable[[TrainingType], TrainingType]:
+    """Зарегистрировать класс тренировки под кодом workout_type."""
+    def decorator(training_class: TrainingType) -> TrainingType:
+        if not (isinstance(training_class, type)
+                and issubclass(training_class, Training)):
+            raise TypeError(f'{training_class!r} не наследуется от Training.')
+        registered = _TRAINING_DICT.get(workout_type)
+        if registered is not None and registered is not training_class:
+            raise ValueError(f'Код {workout_type} уже занят классом '
+                             f'{registered.__name__}.')
+        _TRAINING_ARITY[workout_type] = _get_arity(training_class)
+        _TRAINING_DICT[workout_type] = training_class
+        return training_class
+    return decorator
+
+
+@register_training('RUN')
 class Running(Training):
     """Тренировка: бег."""
 
+    __slots__ = ()
+
     CAL_RUN_SPEED_COEF: float = 18
     CAL_RUN_SPEED_PARAM: float = 20
 
@@ -83,9 +162,12 @@ class Running(Training):
                 * (self.duration * self.MIN_IN_H))
 
 
+@register_training('WLK')
 class SportsWalking(Training):
     """Тренировка: спортивная ходьба."""
 
+    __slots__ = ('height',)
+
     CAL_WALKING_WEIGHT_COEF: float = 0.035
     CAL_WLK_SPEED_POW: float = 2
     CAL_WLK_SPEEDHEIGHT_COEF: float = 0.029
@@ -106,9 +188,15 @@ class SportsWalking(Training):
                  * self.weight) * (self.duration * self.MIN_IN_H))
 
 
+@register_training('SWM')
 class Swimming(Training):
     """Тренировка: плавание."""
 
+    __slots__ = ('_length_pool', '_count_pool')
+
+    length_pool = _read_only('length_pool')
+    count_pool = _read_only('count_pool')
+
     LEN_STEP: float = 1.38
     CAL_SWM_SPEED_PARAM: float = 1.1
     CAL_SWM_WEIGHT_COEF: float = 2
@@ -120,13 +208,15 @@ class Swimming(Training):
                  length_pool: float,
                  count_pool: int) -> None:
         super().__init__(action, duration, weight)
-        self.length_pool = length_pool
-        self.count_pool = count_pool
+        self._length_pool = length_pool
+        self._count_pool = count_pool
 
     def get_mean_speed(self) -> float:
         """Вернуть результат расчета средней скорости."""
-        return (self.length_pool * self.count_pool
-                / self.M_IN_KM / self.duration)
+        if self._speed is None:
+            self._speed = (self.length_pool * self.count_pool
+                           / self.M_IN_KM / self.duration)
+        return self._speed
 
     def get_spent_calories(self) -> float:
         """Вернуть результат расчета затраченных калорий."""
@@ -134,17 +224,50 @@ class Swimming(Training):
                 * self.CAL_SWM_WEIGHT_COEF * self.weight)
 
 
+_plugins_loaded: bool = False
+
+
+def load_plugins(group: str = PLUGIN_GROUP) -> None:
+    """
+    Загрузить классы тренировок из entry points группы group.
+    Имя entry point - код тренировки, значение - класс или модуль,
+    регистрирующий классы декоратором register_training.
+    """
+    global _plugins_loaded
+    _plugins_loaded = True
+    from importlib.metadata import entry_points
+    found = entry_points()
+    if hasattr(found, 'select'):
+        found = found.select(group=group)
+    else:
+        found = found.get(group, ())
+    for entry_point in found:
+        loaded = entry_point.load()
+        if isinstance(loaded, type):
+            register_training(entry_point.name)(loaded)
+
+
+def get_training_class(workout_type: str) -> Type[Training]:
+    """Получить класс тренировки по коду."""
+    training_class = _TRAINING_DICT.get(workout_type)
+    if training_class is not None:
+        return training_class
+    if not _plugins_loaded:
+        load_plugins()
+        return get_training_class(workout_type)
+    raise KeyError(f'Получен неверный код тренировки: {workout_type}. '
+                   'Доступные коды: ' + ', '.join(_TRAINING_DICT.keys()))
+
+
 def read_package(workout_type: str, data: list) -> Training:
     """Прочитать данные полученные от датчиков."""
-    _TRAINING_DICT: Dict[str, Type['Training']] = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking,
-    }
-    if workout_type not in _TRAINING_DICT:
-        raise KeyError(f'Получен неверный код тренировки: {workout_type}. '
-                       'Доступные коды: ' + ', '.join(_TRAINING_DICT.keys()))
-    return _TRAINING_DICT[workout_type](*data)
+    training_class = get_training_class(workout_type)
+    low, high = _TRAINING_ARITY[workout_type]
+    if not low <= len(data) <= high:
+        expected = str(low) if low == high else f'от {low} до {high}'
+        raise TypeError(f'Пакет {workout_type} должен содержать {expected} '
+                        f'значений, получено {len(data)}.')
+    return training_class(*data)
 
 
 def main(training: Training) -> None:
@@ -152,13 +275,43 @@ def main(training: Training) -> None:
     print(training.show_training_info().get_message())
 
 
+def parse_argument(argument: str) -> Tuple[str, list]:
+    """Разобрать пакет из аргумента командной строки вида RUN:15000,1,75."""
+    workout_type, separator, values = argument.partition(':')
+    if not separator or not workout_type or not values:
+        raise ValueError(f'Аргумент {argument!r} должен иметь вид '
+                         'RUN:15000,1,75.')
+    data = []
+    for value in values.split(','):
+        try:
+            data.append(int(value))
+        except ValueError:
+            try:
+                data.append(float(value))
+            except ValueError:
+                raise ValueError(f'В аргументе {argument!r} значение '
+                                 f'{value!r} не является числом.') from None
+    return workout_type, data
+
+
 if __name__ == '__main__':
-    packages = [
-        ('SWM', [720, 1, 80, 25, 40]),
-        ('RUN', [15000, 1, 75]),
-        ('WLK', [9000, 1, 75, 180]),
-    ]
-
-    for workout_type, data in packages:
-        training = read_package(workout_type, data)
-        main(training)
+    import sys
+
+    try:
+        if len(sys.argv) > 1:
+            packages = [parse_argument(argument)
+                        for argument in sys.argv[1:]]
+        else:
+            packages = [
+                ('SWM', [720, 1, 80, 25, 40]),
+                ('RUN', [15000, 1, 75]),
+                ('WLK', [9000, 1, 75, 180]),
+            ]
+
+        for workout_type, data in packages:
+            training = read_package(workout_type, data)
+            main(training)
+    except (KeyError, TypeError, ValueError, IndexError,
+            ZeroDivisionError) as error:
+        print(f'{type(error).__name__}: {error}', file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,203 @@
+"""Необязательная инструментация этапов расчета тренировок.
+
+Пока инструментация выключена, классы и функции homework не меняются,
+поэтому накладных расходов нет. Включение подменяет методы обертками,
+которые считают вызовы, ошибки и гистограмму длительности по этапу
+и типу тренировки. Время вложенных этапов входит во время внешних:
+show_training_info включает get_distance, get_mean_speed и т.д.
+"""
+import json
+import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import homework
+
+BUCKETS: Tuple[float, ...] = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 0.1, 1.0,
+)
+TRAINING_METHODS: Tuple[str, ...] = (
+    '__init__', 'get_distance', 'get_mean_speed', 'get_spent_calories',
+    'show_training_info',
+)
+METRIC_PREFIX: str = 'homework_stage'
+
+
+class Histogram:
+    """Гистограмма длительностей одного этапа."""
+
+    __slots__ = ('counts', 'total', 'count', 'errors')
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'sum': self.total,
+            'buckets': dict(zip([*map(str, BUCKETS), '+Inf'], self.counts)),
+        }
+
+
+class Metrics:
+    """Счетчики и гистограммы по паре (этап, тип тренировки)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(self, stage: str, label: str, seconds: float,
+                failed: bool = False) -> None:
+        with self._lock:
+            histogram = self.histograms.get((stage, label))
+            if histogram is None:
+                histogram = self.histograms[(stage, label)] = Histogram()
+            histogram.observe(seconds)
+            if failed:
+                histogram.errors += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+    def to_json(self) -> str:
+        """Выгрузить метрики в JSON."""
+        with self._lock:
+            data = [{'stage': stage, 'workout_type': label,
+                     **histogram.to_dict()}
+                    for (stage, label), histogram
+                    in sorted(self.histograms.items())]
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Выгрузить метрики в текстовом формате Prometheus."""
+        seconds = f'{METRIC_PREFIX}_seconds'
+        errors = f'{METRIC_PREFIX}_errors_total'
+        lines = [f'# TYPE {seconds} histogram']
+        error_lines = [f'# TYPE {errors} counter']
+        with self._lock:
+            items = sorted(self.histograms.items())
+            for (stage, label), histogram in items:
+                labels = f'stage="{stage}",workout_type="{label}"'
+                cumulative = 0
+                for bound, count in zip([*map(repr, BUCKETS), '+Inf'],
+                                        histogram.counts):
+                    cumulative += count
+                    lines.append(f'{seconds}_bucket{{{labels},le="{bound}"}}'
+                                 f' {cumulative}')
+                lines.append(f'{seconds}_sum{{{labels}}} {histogram.total!r}')
+                lines.append(f'{seconds}_count{{{labels}}} {histogram.count}')
+                error_lines.append(f'{errors}{{{labels}}} {histogram.errors}')
+        return '\n'.join(lines + error_lines) + '\n'
+
+    def write(self, path: str, fmt: str = 'json') -> None:
+        """Атомарно записать метрики в файл в формате json/prometheus."""
+        exporters = {'json': self.to_json, 'prometheus': self.to_prometheus}
+        if fmt not in exporters:
+            raise ValueError(f'Неизвестный формат: {fmt}. '
+                             'Доступные форматы: ' + ', '.join(exporters))
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(exporters[fmt]())
+        os.replace(temporary, path)
+
+
+metrics = Metrics()
+_originals: List[Tuple[object, str, Optional[Callable]]] = []
+
+
+def _timed(stage: str, function: Callable,
+           label: Callable[..., str]) -> Callable:
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            metrics.observe(stage, label(*args), perf_counter() - start, True)
+            raise
+        metrics.observe(stage, label(*args), perf_counter() - start)
+        return result
+    return wrapper
+
+
+def _patch(owner: object, name: str, wrapper: Callable) -> None:
+    _originals.append((owner, name, vars(owner).get(name)))
+    setattr(owner, name, wrapper)
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def enable() -> None:
+    """Включить сбор метрик для homework."""
+    if is_enabled():
+        return
+    _patch(homework, 'get_training_class',
+           _timed('dispatch', homework.get_training_class,
+                  lambda workout_type: workout_type))
+    for training_class in set(homework._TRAINING_DICT.values()):
+        for name in TRAINING_METHODS:
+            _patch(training_class, name,
+                   _timed(name, getattr(training_class, name),
+                          lambda self, *args: type(self).__name__))
+    _patch(homework.InfoMessage, 'get_message',
+           _timed('get_message', homework.InfoMessage.get_message,
+                  lambda message: message.training_type))
+
+
+def disable() -> None:
+    """Выключить сбор метрик и вернуть исходные методы."""
+    while _originals:
+        owner, name, original = _originals.pop()
+        if original is None:
+            delattr(owner, name)
+        else:
+            setattr(owner, name, original)
+
+
+@contextmanager
+def instrumented() -> Iterator[Metrics]:
+    """Собирать метрики внутри блока with."""
+    enable()
+    try:
+        yield metrics
+    finally:
+        disable()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = metrics.to_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_http_server(port: int = 0,
+                      host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Отдавать метрики Prometheus по HTTP в фоновом потоке."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,55 @@
+"""Параллельная обработка пакетов в пуле процессов."""
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence
+
+from homework import InfoMessage
+from stream import Package, iter_messages
+
+CHUNK_SIZE: int = 1000
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Разбить последовательность на списки длиной не больше size."""
+    if size < 1:
+        raise ValueError('Размер порции должен быть положительным.')
+    iterator = iter(items)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def process_chunk(packages: Sequence[Package]) -> List[InfoMessage]:
+    """Посчитать сообщения для одной порции пакетов."""
+    return list(iter_messages(packages))
+
+
+def iter_messages_parallel(packages: Iterable[Package],
+                           workers: Optional[int] = None,
+                           chunk_size: int = CHUNK_SIZE,
+                           executor: Optional[Executor] = None
+                           ) -> Iterator[InfoMessage]:
+    """
+    Посчитать сообщения в нескольких процессах,
+    сохранив порядок входных пакетов.
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    pending: Deque[Future] = deque()
+    try:
+        for chunk in chunked(packages, chunk_size):
+            pending.append(executor.submit(process_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
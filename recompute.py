@@ -0,0 +1,190 @@
+"""Пересчет больших архивов пакетов с контрольными точками.
+
+Вход делится на порции по chunk_size строк. Результат каждой порции
+записывается атомарно в отдельный файл chunk-NNNNNNNN.txt, номер
+завершенной порции сохраняется в файле контрольной точки. Повторный
+запуск пропускает завершенные порции, а строки порций вне диапазона
+--start/--stop и уже завершенных порций не разбираются. Некорректные
+строки и пакеты, а также пакеты, на которых упал расчет,
+не останавливают пересчет: они записываются
+в chunk-NNNNNNNN.rejected.jsonl рядом с результатом порции.
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+from io import StringIO
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, List, Optional, Set
+
+from formatting import format_message
+from parallel import chunked
+from homework import InfoMessage, read_package
+from stream import FORMATS, Package, iter_packages
+from validation import (BAD_RECORD, COMPUTE_ERROR, JsonlQuarantine,
+                        Quarantine, filter_packages)
+
+CHUNK_SIZE: int = 100_000
+
+
+@dataclass
+class RunStats:
+    """Итоги запуска пересчета."""
+
+    computed: int
+    skipped: int
+    messages: int
+    rejected: int = 0
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    temporary = path.with_name(path.name + '.tmp')
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+class BatchRunner:
+    """Пересчет файла пакетов порциями с возобновлением."""
+
+    def __init__(self,
+                 input_path: str,
+                 output_dir: str,
+                 chunk_size: int = CHUNK_SIZE,
+                 fmt: str = 'jsonl',
+                 start: int = 0,
+                 stop: Optional[int] = None) -> None:
+        self.input_path = input_path
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.fmt = fmt
+        self.start = start
+        self.stop = stop
+        suffix = f'{start}-{"end" if stop is None else stop}'
+        self.checkpoint_path = self.output_dir / f'checkpoint-{suffix}.json'
+
+    def chunk_path(self, index: int) -> Path:
+        return self.output_dir / f'chunk-{index:08d}.txt'
+
+    def rejected_path(self, index: int) -> Path:
+        return self.output_dir / f'chunk-{index:08d}.rejected.jsonl'
+
+    def load_checkpoint(self) -> Set[int]:
+        """Прочитать номера завершенных порций."""
+        if not self.checkpoint_path.exists():
+            return set()
+        data = json.loads(self.checkpoint_path.read_text(encoding='utf-8'))
+        if (data['input'] != os.path.abspath(self.input_path)
+                or data['chunk_size'] != self.chunk_size
+                or data.get('unit') != 'lines'):
+            raise ValueError('Контрольная точка создана для другого входа '
+                             'или размера порции.')
+        return set(data['completed'])
+
+    def save_checkpoint(self, completed: Set[int]) -> None:
+        _write_atomic(self.checkpoint_path, json.dumps({
+            'input': os.path.abspath(self.input_path),
+            'chunk_size': self.chunk_size,
+            'unit': 'lines',
+            'start': self.start,
+            'stop': self.stop,
+            'completed': sorted(completed),
+        }))
+
+    def _parse(self,
+               lines: Iterable[str],
+               quarantine: Quarantine) -> List[Package]:
+        """Разобрать строки порции, плохие строки отправить в карантин."""
+        packages: List[Package] = []
+        for line in lines:
+            try:
+                packages.extend(iter_packages([line], self.fmt))
+            except (KeyError, TypeError, ValueError):
+                quarantine.put('', [line.rstrip('\r\n')], BAD_RECORD)
+        return packages
+
+    @staticmethod
+    def _compute(packages: Iterable[Package],
+                 quarantine: Quarantine) -> List[InfoMessage]:
+        """Рассчитать пакеты по одному, упавшие отправить в карантин."""
+        messages: List[InfoMessage] = []
+        for workout_type, data in packages:
+            try:
+                messages.append(
+                    read_package(workout_type, data).show_training_info())
+            except Exception:
+                quarantine.put(workout_type, data, COMPUTE_ERROR)
+        return messages
+
+    def run(self) -> RunStats:
+        """Пересчитать незавершенные порции диапазона."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        completed = self.load_checkpoint()
+        stats = RunStats(0, 0, 0)
+        with open(self.input_path, encoding='utf-8', newline='') as source:
+            lines = islice(
+                source, self.start * self.chunk_size,
+                None if self.stop is None else self.stop * self.chunk_size)
+            chunks = enumerate(chunked(lines, self.chunk_size), self.start)
+            for index, chunk in chunks:
+                if index in completed:
+                    stats.skipped += 1
+                    continue
+                rejected = StringIO()
+                quarantine = JsonlQuarantine(rejected)
+                messages = self._compute(filter_packages(
+                    self._parse(chunk, quarantine), quarantine), quarantine)
+                if len(quarantine):
+                    _write_atomic(self.rejected_path(index),
+                                  rejected.getvalue())
+                _write_atomic(self.chunk_path(index),
+                              format_message.render(messages))
+                completed.add(index)
+                self.save_checkpoint(completed)
+                stats.computed += 1
+                stats.messages += len(messages)
+                stats.rejected += len(quarantine)
+        return stats
+
+
+def merge_outputs(output_dir: str, target: IO[str]) -> int:
+    """Склеить результаты порций по порядку, вернуть число порций."""
+    paths = sorted(Path(output_dir).glob('chunk-*.txt'))
+    for path in paths:
+        target.write(path.read_text(encoding='utf-8'))
+    return len(paths)
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Пересчет архива пакетов с контрольными точками.')
+    parser.add_argument('input', help='файл с пакетами')
+    parser.add_argument('output_dir', help='каталог для результатов порций')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='jsonl')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--start', type=int, default=0,
+                        help='номер первой порции диапазона')
+    parser.add_argument('--stop', type=int,
+                        help='номер порции, следующей за диапазоном')
+    parser.add_argument('--merge', metavar='FILE',
+                        help='после пересчета склеить порции в FILE')
+    args = parser.parse_args(argv)
+
+    stats = BatchRunner(args.input, args.output_dir, args.chunk_size,
+                        args.format, args.start, args.stop).run()
+    print(f'Посчитано порций: {stats.computed}, пропущено: {stats.skipped}, '
+          f'сообщений: {stats.messages}, отклонено: {stats.rejected}',
+          file=sys.stderr)
+    if args.merge:
+        with open(args.merge, 'w', encoding='utf-8') as target:
+            merge_outputs(args.output_dir, target)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,252 @@
+"""Асинхронный сервис расчета тренировок.
+
+Протокол: JSON Lines в обе стороны. Клиент присылает пакет в формате
+stream.package_from_record, к словарю можно добавить поле "id".
+Строка, не начинающаяся с [ или {, читается как аргумент командной
+строки homework.py: RUN:15000,1,75.
+На каждый пакет сервер отвечает одной строкой в порядке получения:
+{"id": ..., "training_type": ..., "duration": ..., "distance": ...,
+"speed": ..., "calories": ..., "message": ...} или {"id": ..., "error": ...}.
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from batch import compute_packages
+from formatting import format_message
+from homework import InfoMessage, parse_argument, read_package
+from stream import Package, package_from_record
+
+BATCH_WINDOW: float = 0.002
+MAX_BATCH: int = 1024
+QUEUE_SIZE: int = 8192
+MAX_PENDING: int = 256
+
+_Job = Tuple[Package, asyncio.Future]
+
+
+def _reply(request_id: Any, message: InfoMessage) -> Dict[str, Any]:
+    return {
+        'id': request_id,
+        'training_type': message.training_type,
+        'duration': message.duration,
+        'distance': message.distance,
+        'speed': message.speed,
+        'calories': message.calories,
+        'message': format_message(message),
+    }
+
+
+def _check_finite(message: InfoMessage) -> InfoMessage:
+    """Не отдавать клиенту inf и nan: в JSON их нет."""
+    for value in (message.duration, message.distance,
+                  message.speed, message.calories):
+        if not math.isfinite(value):
+            raise ValueError('Результат расчета не является конечным '
+                             f'числом: {message}')
+    return message
+
+
+def _compute_one(package: Package) -> InfoMessage:
+    return _check_finite(read_package(*package).show_training_info())
+
+
+def _resolve(future: asyncio.Future, function: Callable, *args) -> None:
+    """Передать в future результат function(*args) или ее исключение."""
+    if future.done():
+        return
+    try:
+        future.set_result(function(*args))
+    except Exception as error:
+        future.set_exception(error)
+
+
+def _error(request_id: Any, error: Exception) -> Dict[str, Any]:
+    return {'id': request_id, 'error': f'{type(error).__name__}: {error}'}
+
+
+class WorkoutServer:
+    """Сервер, собирающий пакеты всех соединений в общие пачки."""
+
+    def __init__(self,
+                 batch_window: float = BATCH_WINDOW,
+                 max_batch: int = MAX_BATCH,
+                 queue_size: int = QUEUE_SIZE,
+                 max_pending: int = MAX_PENDING) -> None:
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.max_pending = max_pending
+        self.batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self,
+                    host: str = '127.0.0.1',
+                    port: int = 0,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Запустить сервер на TCP-порту или Unix-сокете path."""
+        self._queue = asyncio.Queue(self.queue_size)
+        self._batcher = asyncio.create_task(self._run_batches())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle, host, port)
+        return self._server
+
+    @property
+    def address(self):
+        """Адрес первого слушающего сокета."""
+        return self._server.sockets[0].getsockname()
+
+    async def close(self) -> None:
+        """Остановить сервер и обработчик пачек."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> 'WorkoutServer':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def compute(self, package: Package) -> InfoMessage:
+        """Поставить пакет в очередь и дождаться результата."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((package, future))
+        return await future
+
+    async def _run_batches(self) -> None:
+        """Собирать пакеты в пачки и рассчитывать их."""
+        loop = asyncio.get_running_loop()
+        while True:
+            jobs: List[_Job] = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(jobs) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    jobs.append(await asyncio.wait_for(self._queue.get(),
+                                                       timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                self._compute_jobs(jobs)
+            except Exception as error:
+                for _, future in jobs:
+                    if not future.done():
+                        future.set_exception(error)
+            self.batches += 1
+
+    @staticmethod
+    def _compute_jobs(jobs: List[_Job]) -> None:
+        """
+        Рассчитать пачку, при любой ошибке - по одному пакету,
+        чтобы плохой пакет не задел остальные.
+        """
+        try:
+            results = compute_packages([package for package, _ in jobs])
+        except Exception:
+            for package, future in jobs:
+                _resolve(future, _compute_one, package)
+            return
+        for (_, future), message in zip(jobs, results):
+            _resolve(future, _check_finite, message)
+
+    async def _handle(self,
+                      reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        """Обработать одно соединение клиента."""
+        pending: asyncio.Queue = asyncio.Queue(self.max_pending)
+        replies = asyncio.create_task(self._write_replies(pending, writer))
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                await pending.put(self._submit(line))
+        finally:
+            await pending.put(None)
+            await replies
+            writer.close()
+
+    def _submit(self, line: bytes) -> Tuple[Any, asyncio.Future]:
+        """Разобрать строку запроса и поставить пакет в очередь."""
+        request_id = None
+        try:
+            if line.lstrip()[:1] not in (b'[', b'{'):
+                package = parse_argument(line.decode().strip())
+            else:
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    request_id = record.get('id')
+                package = package_from_record(record)
+        except (KeyError, TypeError, ValueError) as error:
+            future = asyncio.get_running_loop().create_future()
+            future.set_exception(error)
+            return request_id, future
+        return request_id, asyncio.ensure_future(self.compute(package))
+
+    @staticmethod
+    async def _write_replies(pending: asyncio.Queue,
+                             writer: asyncio.StreamWriter) -> None:
+        """Отправлять ответы в порядке запросов с учетом drain."""
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            request_id, future = item
+            try:
+                line = json.dumps(_reply(request_id, await future),
+                                  ensure_ascii=False, allow_nan=False)
+            except Exception as error:
+                line = json.dumps(_error(request_id, error),
+                                  ensure_ascii=False)
+            writer.write(line.encode() + b'\n')
+            await writer.drain()
+
+
+async def serve(host: str,
+                port: int,
+                path: Optional[str],
+                batch_window: float) -> None:
+    """Запустить сервер и работать до остановки."""
+    async with WorkoutServer(batch_window=batch_window) as server:
+        await server.start(host, port, path)
+        print(f'Сервер слушает {server.address}', file=sys.stderr)
+        await asyncio.Event().wait()
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Асинхронный сервис расчета тренировок.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='путь к Unix-сокету вместо TCP')
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW,
+                        help='время сбора пачки, секунд')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix,
+                          args.batch_window))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,144 @@
+"""Потоковая обработка пакетов из stdin или файла."""
+import argparse
+import csv
+import json
+import sys
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+from formatting import format_message
+from homework import InfoMessage, read_package
+
+FORMATS = ('jsonl', 'csv')
+CHUNK_SIZE: int = 4096
+
+Package = Tuple[str, list]
+
+
+def _parse_number(value: str) -> float:
+    """Преобразовать строковое значение CSV в число."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def package_from_record(record) -> Package:
+    """
+    Получить пакет из разобранной записи JSON:
+    ["RUN", [15000, 1, 75]] или {"workout_type": "RUN", "data": [...]}.
+    """
+    if isinstance(record, dict):
+        record = (record['workout_type'], record['data'])
+    if len(record) != 2:
+        raise ValueError('Ожидалась пара (код тренировки, данные).')
+    workout_type, data = record
+    return workout_type, list(data)
+
+
+def parse_jsonl(lines: Iterable[str]) -> Iterator[Package]:
+    """Прочитать пакеты в формате JSON Lines."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield package_from_record(json.loads(line))
+        except ValueError as error:
+            raise ValueError(f'Строка {number}: {error}') from error
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Package]:
+    """Прочитать пакеты CSV вида: RUN,15000,1,75."""
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        workout_type, *data = row
+        yield workout_type.strip(), [_parse_number(value) for value in data]
+
+
+def iter_packages(source: IO[str], fmt: str = 'jsonl') -> Iterator[Package]:
+    """Лениво прочитать пакеты из текстового потока."""
+    if fmt == 'jsonl':
+        return parse_jsonl(source)
+    if fmt == 'csv':
+        return parse_csv(source)
+    raise ValueError(f'Неизвестный формат: {fmt}. '
+                     'Доступные форматы: ' + ', '.join(FORMATS))
+
+
+def iter_messages(packages: Iterable[Package]) -> Iterator[InfoMessage]:
+    """Получить сообщения о тренировках по мере чтения пакетов."""
+    for workout_type, data in packages:
+        yield read_package(workout_type, data).show_training_info()
+
+
+def write_messages(messages: Iterable[InfoMessage],
+                   target: IO[str],
+                   chunk_size: int = CHUNK_SIZE) -> int:
+    """Записать сообщения порциями по chunk_size строк."""
+    return format_message.write(messages, target, chunk_size)
+
+
+def process_stream(source: IO[str],
+                   target: IO[str],
+                   fmt: str = 'jsonl',
+                   chunk_size: int = CHUNK_SIZE,
+                   workers: int = 1,
+                   quarantine=None) -> int:
+    """
+    Обработать поток пакетов и вернуть количество сообщений.
+    При workers > 1 расчет идет в пуле процессов. Если передан
+    quarantine (validation.Quarantine), некорректные пакеты
+    отправляются в него, а не прерывают обработку.
+    """
+    packages = iter_packages(source, fmt)
+    if quarantine is not None:
+        from validation import filter_packages
+        packages = filter_packages(packages, quarantine)
+    if workers > 1:
+        from parallel import iter_messages_parallel
+        messages = iter_messages_parallel(packages, workers, chunk_size)
+    else:
+        messages = iter_messages(packages)
+    return write_messages(messages, target, chunk_size)
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Потоковая обработка пакетов фитнес-трекера.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='файл с пакетами, по умолчанию stdin')
+    parser.add_argument('-o', '--output', default='-',
+                        help='файл для сообщений, по умолчанию stdout')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='jsonl')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='количество процессов для расчета')
+    parser.add_argument('--quarantine',
+                        help='файл JSON Lines для некорректных пакетов')
+    args = parser.parse_args(argv)
+
+    source = (sys.stdin if args.input == '-'
+              else open(args.input, encoding='utf-8', newline=''))
+    target = (sys.stdout if args.output == '-'
+              else open(args.output, 'w', encoding='utf-8'))
+    rejects = quarantine = None
+    if args.quarantine:
+        from validation import JsonlQuarantine
+        rejects = open(args.quarantine, 'w', encoding='utf-8')
+        quarantine = JsonlQuarantine(rejects)
+    try:
+        process_stream(source, target, args.format, args.chunk_size,
+                       args.workers, quarantine)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        if rejects is not None:
+            rejects.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,59 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+import aggregation
+import homework
+
+MONDAY = datetime(2022, 4, 25, 8, 30)
+SATURDAY = datetime(2022, 4, 30, 19, 0)
+
+
+def message(workout_type, data):
+    return homework.read_package(workout_type, data).show_training_info()
+
+
+def test_buckets():
+    assert aggregation.day_bucket(SATURDAY) == '2022-04-30'
+    assert aggregation.week_bucket(SATURDAY) == '2022-04-25'
+    assert aggregation.week_bucket(date(2022, 4, 25)) == '2022-04-25'
+    timestamp = datetime(2022, 4, 30, tzinfo=timezone.utc).timestamp()
+    assert aggregation.day_bucket(timestamp) == '2022-04-30'
+
+
+def test_running_totals():
+    store = aggregation.AggregationStore()
+    run = message('RUN', [15000, 1, 75])
+    swim = message('SWM', [720, 1, 80, 25, 40])
+    store.add('anna', MONDAY, run)
+    store.add('anna', SATURDAY, swim)
+    store.add('oleg', SATURDAY, run)
+
+    day = store.get('anna', 'day', SATURDAY)
+    assert (day.count, day.calories) == (1, swim.calories)
+    week = store.get('anna', 'week', MONDAY)
+    assert week.count == 2
+    assert week.distance == run.distance + swim.distance
+    assert week.mean_calories == (run.calories + swim.calories) / 2
+    assert week.mean_speed == week.distance / week.duration
+    assert store.get('anna', 'day', date(2022, 4, 26)) is None
+    assert store.athletes() == ('anna', 'oleg')
+    assert set(store.buckets('anna', 'day')) == {'2022-04-25', '2022-04-30'}
+
+
+def test_snapshot_restore(tmp_path):
+    store = aggregation.AggregationStore(('week',))
+    store.add('anna', MONDAY, message('WLK', [9000, 1, 75, 180]))
+    path = str(tmp_path / 'totals.json')
+    store.snapshot(path)
+
+    restored = aggregation.AggregationStore.restore(path)
+    assert restored.periods == ('week',)
+    assert restored.buckets('anna', 'week') == store.buckets('anna', 'week')
+    restored.add('anna', SATURDAY, message('RUN', [15000, 1, 75]))
+    assert restored.get('anna', 'week', SATURDAY).count == 2
+
+
+def test_unknown_period():
+    with pytest.raises(KeyError):
+        aggregation.AggregationStore(('month',))
@@ -0,0 +1,104 @@
+import pytest
+
+import archive
+import batch
+import homework
+
+SESSIONS = [
+    (1, 100.0, 'RUN', [15000, 1, 75]),
+    (2, 150.0, 'RUN', [9000, 0.5, 80]),
+    (1, 200.0, 'SWM', [720, 1, 80, 25, 40]),
+    (1, 300.0, 'WLK', [9000, 1, 75, 180]),
+    (1, 50.0, 'RUN', [1206, 12.5, 6]),
+    (1, 400.0, 'RUN', [3000, 0.25, 70]),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with archive.SessionArchive(tmp_path) as store:
+        for athlete, timestamp, code, data in SESSIONS:
+            store.append(athlete, timestamp, code, data)
+        yield store
+
+
+def test_query_range(store):
+    found = list(store.query(1, 50, 300))
+    assert [(code, timestamp) for code, _, timestamp, _ in found] == [
+        ('RUN', 50.0), ('RUN', 100.0), ('SWM', 200.0),
+    ], 'Запрос должен вернуть записи [start, end) по кодам и времени'
+    assert found[1][3] == (15000, 1.0, 75.0)
+
+
+def test_query_by_type_and_athlete(store):
+    assert [timestamp for *_, timestamp, _ in
+            store.query(1, 0, 1000, 'RUN')] == [50.0, 100.0, 400.0]
+    assert list(store.query(3, 0, 1000)) == []
+    assert len(store) == len(SESSIONS)
+
+
+def test_compute_matches_scalar(store):
+    results = store.compute(1, 0, 1000)
+    assert set(results) == {'RUN', 'SWM', 'WLK'}
+    for code, result in results.items():
+        expected = [homework.read_package(code, data).show_training_info()
+                    for athlete, _, session_code, data
+                    in sorted(SESSIONS, key=lambda session: session[1])
+                    if athlete == 1 and session_code == code]
+        assert isinstance(result, batch.BatchResult)
+        assert list(result.calories) == [
+            message.calories for message in expected]
+
+
+def test_reopen_uses_index(tmp_path):
+    with archive.SessionArchive(tmp_path) as store:
+        for session in SESSIONS:
+            store.append(*session)
+    assert (tmp_path / 'RUN.idx.json').exists()
+    with archive.SessionArchive(tmp_path) as store:
+        assert len(store) == len(SESSIONS)
+        store.append(1, 500.0, 'RUN', [100, 0.1, 60])
+        assert [timestamp for *_, timestamp, _ in
+                store.query(1, 350, 1000)] == [400.0, 500.0]
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    with archive.SessionArchive(tmp_path) as store:
+        for session in SESSIONS:
+            store.append(*session)
+    (tmp_path / 'RUN.idx.json').unlink()
+    with archive.SessionArchive(tmp_path) as store:
+        assert [timestamp for *_, timestamp, _ in
+                store.query(1, 0, 1000, 'RUN')] == [50.0, 100.0, 400.0]
+
+
+def test_unknown_code(tmp_path):
+    with archive.SessionArchive(tmp_path) as store:
+        with pytest.raises(KeyError):
+            store.append(1, 0.0, 'XXX', [1, 2, 3])
+
+
+def test_torn_write_is_truncated(tmp_path):
+    with archive.SessionArchive(tmp_path) as store:
+        for session in SESSIONS:
+            store.append(*session)
+    with open(tmp_path / 'RUN.dat', 'ab') as file:
+        file.write(b'\x01\x02\x03')
+    with archive.SessionArchive(tmp_path) as store:
+        store.append(1, 500.0, 'RUN', [100, 0.1, 60])
+    with archive.SessionArchive(tmp_path) as store:
+        assert [(timestamp, data) for _, _, timestamp, data in
+                store.query(1, 350, 1000, 'RUN')] == [
+            (400.0, (3000, 0.25, 70.0)), (500.0, (100, 0.1, 60.0)),
+        ], 'Недописанная запись не должна сдвигать следующие.'
+
+
+def test_flush_syncs_index(tmp_path, monkeypatch):
+    synced = []
+    with archive.SessionArchive(tmp_path) as store:
+        store.append(*SESSIONS[0])
+        monkeypatch.setattr(archive.os, 'fsync', synced.append)
+        store.flush()
+        monkeypatch.undo()
+        assert len(synced) == 2, (
+            'Индекс должен записываться с fsync, как и файл записей.')
@@ -0,0 +1,132 @@
+import pytest
+
+import batch
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [420, 4, 20, 42, 4]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('WLK', [1206, 12, 6, 12]),
+]
+
+
+def expected_rows(workout_type):
+    rows = []
+    for code, data in PACKAGES:
+        if code == workout_type:
+            training = homework.read_package(code, data)
+            rows.append((training.get_distance(),
+                         training.get_mean_speed(),
+                         training.get_spent_calories()))
+    return rows
+
+
+@pytest.mark.parametrize('compute', [
+    batch._compute_scalar, batch._compute_vectorized,
+])
+@pytest.mark.parametrize('workout_type', ['SWM', 'RUN', 'WLK'])
+def test_compute_matches_scalar(compute, workout_type):
+    if compute is batch._compute_vectorized:
+        pytest.importorskip('numpy')
+    groups = batch.group_packages(PACKAGES)
+    training_class = homework.get_training_class(workout_type)
+    columns = [groups[workout_type][name]
+               for name in batch.field_names(training_class)]
+    _, distance, speed, calories = compute(training_class, columns)
+    result = list(zip(distance, speed, calories))
+    assert result == expected_rows(workout_type), (
+        'Пакетный расчет должен совпадать с расчетом по классам.'
+    )
+
+
+def test_compute_batches_messages():
+    results = batch.compute_batches(batch.group_packages(PACKAGES))
+    assert set(results) == {'SWM', 'RUN', 'WLK'}
+    messages = [message.get_message()
+                for code in ('SWM', 'RUN', 'WLK')
+                for message in results[code].to_messages()]
+    expected = [homework.read_package(code, data)
+                .show_training_info().get_message()
+                for code in ('SWM', 'RUN', 'WLK')
+                for package_code, data in PACKAGES
+                if package_code == code]
+    assert messages == expected
+
+
+def test_field_names():
+    assert batch.field_names(homework.Swimming) == (
+        'action', 'duration', 'weight', 'length_pool', 'count_pool'
+    )
+    assert batch.field_names(homework.Running) == (
+        'action', 'duration', 'weight'
+    )
+
+
+def test_compute_batch_errors():
+    with pytest.raises(KeyError):
+        batch.compute_batch('RUN', {'action': [1], 'duration': [1]})
+    with pytest.raises(ValueError):
+        batch.compute_batch('RUN', {'action': [1, 2], 'duration': [1],
+                                    'weight': [1]})
+    with pytest.raises(KeyError):
+        batch.compute_batch('BIKE', {})
+    with pytest.raises(TypeError):
+        batch.group_packages([('RUN', [1, 2])])
+
+
+@pytest.mark.parametrize('compute', [
+    batch._compute_scalar, batch._compute_vectorized,
+])
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [100, 0, 75]),
+    ('RUN', [0, 0, 75]),
+    ('WLK', [9000, 1, 75, 0]),
+    ('SWM', [720, 0, 80, 25, 40]),
+])
+def test_zero_division_is_raised(compute, workout_type, data):
+    if compute is batch._compute_vectorized:
+        pytest.importorskip('numpy')
+    training_class = homework.get_training_class(workout_type)
+    with pytest.raises(ZeroDivisionError):
+        homework.read_package(workout_type, data).show_training_info()
+    with pytest.raises(ZeroDivisionError):
+        compute(training_class, [[value] for value in data])
+
+
+def test_compute_packages_keeps_order():
+    expected = [homework.read_package(code, data).show_training_info()
+                for code, data in PACKAGES[::-1]]
+    assert batch.compute_packages(PACKAGES[::-1]) == expected
+
+
+@pytest.mark.parametrize('compute', [
+    batch._compute_scalar, batch._compute_vectorized,
+])
+@pytest.mark.parametrize('workout_type', ['SWM', 'RUN', 'WLK'])
+def test_float32_within_error_bound(compute, workout_type):
+    if compute is batch._compute_vectorized:
+        pytest.importorskip('numpy')
+    groups = batch.group_packages(PACKAGES)
+    training_class = homework.get_training_class(workout_type)
+    columns = [groups[workout_type][name]
+               for name in batch.field_names(training_class)]
+    _, distance, speed, calories = compute(training_class, columns, 'f')
+    for row, expected in zip(zip(distance, speed, calories),
+                             expected_rows(workout_type)):
+        assert row == pytest.approx(expected, rel=1e-5), (
+            'Расчет во float32 должен укладываться в оценку ошибки.'
+        )
+
+
+def test_precision_option():
+    columns = batch.group_packages(PACKAGES)['RUN']
+    result = batch.compute_batch('RUN', columns, precision='float32')
+    assert getattr(result.calories, 'itemsize', 4) == 4
+    assert batch.compute_packages(PACKAGES, 'float32')[2].calories == (
+        pytest.approx(homework.read_package(*PACKAGES[2])
+                      .get_spent_calories(), rel=1e-6))
+    with pytest.raises(ValueError):
+        batch.compute_batch('RUN', columns, precision='float16')
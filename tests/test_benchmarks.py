@@ -0,0 +1,116 @@
+import pytest
+
+from benchmarks import suite
+
+
+def test_make_packages():
+    packages = suite.make_packages(50, suite.MIXES['uniform'])
+    assert len(packages) == 50
+    assert {code for code, _ in packages} == {'RUN', 'WLK', 'SWM'}
+    assert packages == suite.make_packages(50, suite.MIXES['uniform'])
+
+
+def test_run_suite_and_compare():
+    report = suite.run_suite(sizes=(1, 30), mixes=('uniform',), repeat=1)
+    assert len(report['results']) == 2 * len(suite.BENCHMARKS)
+    for result in report['results']:
+        assert result['seconds'] >= 0
+    assert suite.compare(report, report) == []
+
+    slower = {'results': [dict(result, ns_per_item=result['ns_per_item'] * 2)
+                          for result in report['results']
+                          if result['ns_per_item']]}
+    regressions = suite.compare(report, slower)
+    assert regressions and all(item['ratio'] > 1.9 for item in regressions)
+
+
+def test_differential_engines_match_reference():
+    from benchmarks import differential
+
+    packages = (differential.EDGE_PACKAGES
+                + suite.make_packages(60, suite.MIXES['uniform']))
+    for name in ('batch', 'cache', 'compact', 'float32'):
+        engine = differential.ENGINES[name]
+        assert differential.check_engine(engine, packages) == [], (
+            f'Движок {name} должен совпадать с эталоном')
+
+
+def test_differential_detects_true_division():
+    from benchmarks import differential
+
+    def true_division(packages):
+        messages = differential.reference(packages)
+        for (code, data), message in zip(packages, messages):
+            if code == 'WLK':
+                training = differential.read_package(code, data)
+                message.calories = (
+                    (training.CAL_WALKING_WEIGHT_COEF * training.weight
+                     + (training.get_mean_speed() ** 2 / training.height)
+                     * training.CAL_WLK_SPEEDHEIGHT_COEF * training.weight)
+                    * training.duration * training.MIN_IN_H)
+        return messages
+
+    engine = differential.Engine('true-division', true_division)
+    mismatches = differential.check_engine(
+        engine, differential.EDGE_PACKAGES)
+    assert mismatches and {item.field for item in mismatches} == {
+        'calories'}
+    assert all(item.package[0] == 'WLK' for item in mismatches)
+
+
+def test_edge_packages_cross_floor_boundary():
+    from benchmarks import differential
+
+    quotients = []
+    for workout_type, data in differential.EDGE_PACKAGES:
+        if workout_type == 'WLK':
+            training = differential.read_package(workout_type, data)
+            quotients.append(training.get_mean_speed() ** 2
+                             // training.height)
+    assert {8, 9, 3} <= set(quotients), (
+        'Граничные пакеты должны давать "//" по обе стороны от целого.')
+    pytest.importorskip('numpy')
+    engine = differential.ENGINES['float32']
+    plain = differential.Engine('float32-plain', engine.compute,
+                                engine.rel_tol, engine.abs_tol)
+    assert differential.check_engine(plain, differential.EDGE_PACKAGES), (
+        'Без допуска на "//" float32 должен расходиться с эталоном.')
+
+
+def test_float32_tolerates_floor_step():
+    pytest.importorskip('numpy')
+    from benchmarks import differential
+
+    package = ('WLK', [2000, 0.43333333333333335, 70, 1])
+    expected = differential.reference([package])
+    actual = differential.compute_packages([package], precision='float32')
+    assert expected[0].calories - actual[0].calories > 50
+    engine = differential.ENGINES['float32']
+    assert differential.compare_messages(
+        [package], expected, actual, engine.rel_tol, engine.abs_tol,
+        engine.calories_tol) == [], (
+        'Допуск float32 должен покрывать скачок "//" из оценок batch.py.')
+    assert differential.floor_step_tol(('WLK', [9000, 1, 75, 180])) == 0
+
+
+def test_differential_report():
+    from benchmarks import differential
+
+    report = differential.run_harness(('batch',), size=30, repeat=1)
+    result, = report['engines']
+    assert result['mismatches'] == 0
+    assert set(result['timings']) == set(differential.WORKOUT_TYPES)
+    assert all(timing['speedup'] > 0 for timing in result['timings'].values())
+
+
+def test_measure_uses_fresh_setup_per_repeat():
+    prepared = []
+
+    def setup():
+        prepared.append(object())
+        return prepared[-1]
+
+    received = []
+    suite.measure(received.append, 3, setup)
+    assert received == prepared and len(set(map(id, received))) == 3, (
+        'Каждый повтор должен получать свежие данные.')
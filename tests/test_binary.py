@@ -0,0 +1,77 @@
+import pytest
+
+import binary
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12.5, 6]),
+]
+
+
+@pytest.mark.parametrize('workout_type, size', [
+    ('RUN', 24), ('WLK', 32), ('SWM', 40),
+])
+def test_payload_struct(workout_type, size):
+    assert binary.payload_struct(workout_type).size == size
+
+
+def test_frames_roundtrip():
+    buffer = binary.encode_frames(PACKAGES)
+    decoded = list(binary.iter_frames(buffer))
+    assert [code for code, _ in decoded] == [code for code, _ in PACKAGES]
+    for (code, data), (_, expected) in zip(decoded, PACKAGES):
+        assert list(data) == expected
+        assert (homework.read_package(code, data).get_spent_calories()
+                == homework.read_package(code, expected)
+                .get_spent_calories())
+
+
+def test_truncated_frame():
+    buffer = binary.encode_frames(PACKAGES)[:-1]
+    with pytest.raises(ValueError):
+        list(binary.iter_frames(buffer))
+
+
+def test_encode_code_too_long():
+    with pytest.raises(ValueError):
+        binary.encode_code('SWIMM')
+
+
+def test_decode_store():
+    store = binary.decode_store(binary.encode_frames(PACKAGES))
+    assert len(store) == len(PACKAGES)
+    assert list(store.arrays['RUN'].columns['duration']) == [1, 12.5]
+
+
+def test_columns_file(tmp_path):
+    rows = [data for code, data in PACKAGES if code == 'RUN']
+    path = tmp_path / 'run.bin'
+    path.write_bytes(binary.encode_columns('RUN', rows))
+    result = binary.compute_columns_file('RUN', str(path))
+    assert list(result.calories) == [
+        homework.Running(*data).get_spent_calories() for data in rows
+    ]
+    empty = tmp_path / 'empty.bin'
+    empty.write_bytes(b'')
+    assert len(binary.compute_columns_file('RUN', str(empty))) == 0
+
+
+def test_columns_outlive_mapping(tmp_path):
+    rows = [data for code, data in PACKAGES if code == 'RUN']
+    path = tmp_path / 'run.bin'
+    path.write_bytes(binary.encode_columns('RUN', rows))
+    with binary.open_mapped(str(path)) as buffer:
+        columns = binary.decode_columns('RUN', buffer)
+    assert list(columns['duration']) == [1, 12.5], (
+        'Колонки должны оставаться доступными после выхода из блока.')
+    del columns
+    with binary.open_mapped(str(path)) as buffer:
+        assert len(buffer) == 48
+
+
+def test_decode_columns_bad_size():
+    with pytest.raises(ValueError):
+        binary.decode_columns('RUN', b'\0' * 25)
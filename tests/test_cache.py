@@ -0,0 +1,143 @@
+import random
+import threading
+
+import pytest
+
+import cache
+import homework
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1, 75, 180]),
+])
+def test_metrics_are_memoized(workout_type, data):
+    training = homework.read_package(workout_type, data)
+    speed = training.get_mean_speed()
+    calories = training.get_spent_calories()
+    assert training.get_mean_speed() is speed
+    assert training.get_spent_calories() == calories
+    fresh = homework.read_package(workout_type, data)
+    assert fresh.show_training_info() == training.show_training_info()
+
+
+def test_lru_hits_and_evictions():
+    message_cache = cache.MessageCache(maxsize=2)
+    first = message_cache.get('RUN', [15000, 1, 75])
+    assert message_cache.get('RUN', (15000.0, 1.0, 75.0)) is first
+    message_cache.get('WLK', [9000, 1, 75, 180])
+    message_cache.get('RUN', [15000, 1, 75])
+    message_cache.get('SWM', [720, 1, 80, 25, 40])
+    stats = message_cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (
+        2, 3, 1, 2)
+    assert message_cache.get('RUN', [15000, 1, 75]) is first
+    assert first == homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info()
+
+
+def test_disable_and_resize():
+    message_cache = cache.MessageCache(maxsize=4)
+    for action in range(4):
+        message_cache.get('RUN', [action, 1, 75])
+    message_cache.configure(maxsize=1)
+    assert message_cache.stats().size == 1
+    assert message_cache.stats().evictions == 3
+    message_cache.configure(enabled=False)
+    first = message_cache.get('RUN', [3, 1, 75])
+    assert message_cache.get('RUN', [3, 1, 75]) is not first
+    assert message_cache.stats().hits == 0
+    message_cache.clear()
+    assert message_cache.stats() == cache.CacheStats(0, 0, 0, 0, 1)
+
+
+def test_errors_are_not_cached():
+    message_cache = cache.MessageCache()
+    with pytest.raises(KeyError):
+        message_cache.get('BIKE', [1])
+    assert message_cache.stats().size == 0
+
+
+def test_process_wide_cache():
+    cache.message_cache.clear()
+    first = cache.cached_training_info('RUN', [15000, 1, 75])
+    assert cache.cached_training_info('RUN', [15000, 1, 75]) is first
+    assert cache.message_cache.stats().hits == 1
+    cache.message_cache.clear()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_session_store_ttl_and_size():
+    clock = FakeClock()
+    store = cache.SessionStore(maxsize=2, ttl=10, stripes=1, clock=clock)
+    first = store.get_or_compute('s1', 'RUN', [15000, 1, 75])
+    assert store.get_or_compute('s1', 'RUN', [15000, 1, 75]) is first
+    store.put('s2', first)
+    store.put('s3', first)
+    assert store.get('s1') is None
+    clock.now = 11
+    assert store.get('s3') is None
+    stats = store.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expired,
+            stats.size) == (1, 3, 1, 1, 1)
+    store.invalidate('s2')
+    assert len(store) == 0
+    with pytest.raises(ValueError):
+        cache.SessionStore(maxsize=0)
+
+
+@pytest.mark.parametrize('maxsize, stripes', [(128, 8), (100, 16)])
+def test_session_store_concurrent_stress(maxsize, stripes):
+    packages = {f'session-{index}': ('RUN', [1000 + index, 1, 75])
+                for index in range(200)}
+    expected = {session_id: homework.read_package(*package)
+                .show_training_info()
+                for session_id, package in packages.items()}
+    store = cache.SessionStore(maxsize=maxsize, ttl=60, stripes=stripes)
+    errors = []
+    session_ids = list(packages)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            session_id = rng.choice(session_ids)
+            message = store.get_or_compute(session_id, *packages[session_id])
+            if message != expected[session_id]:
+                errors.append(session_id)
+
+    threads = [threading.Thread(target=worker, args=(seed,))
+               for seed in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = store.stats()
+    assert errors == []
+    assert stats.hits + stats.misses == 16 * 2000
+    assert stats.size <= maxsize, 'Хранилище не должно превышать maxsize.'
+    assert stats.hits > 0 and stats.evictions > 0
+    for index in range(10_000):
+        store.put(index, expected['session-0'])
+    assert len(store) == maxsize
+
+
+@pytest.mark.parametrize('workout_type, data, name', [
+    ('RUN', [15000, 1, 75], 'action'),
+    ('RUN', [15000, 1, 75], 'duration'),
+    ('SWM', [720, 1, 80, 25, 40], 'count_pool'),
+])
+def test_cached_inputs_are_read_only(workout_type, data, name):
+    training = homework.read_package(workout_type, data)
+    speed = training.get_mean_speed()
+    with pytest.raises(AttributeError):
+        setattr(training, name, 1)
+    assert training.get_mean_speed() == speed, (
+        'Входные данные, от которых зависит кэш, менять нельзя.')
@@ -0,0 +1,80 @@
+import asyncio
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import client
+import homework
+import service
+from conftest import Capturing
+
+ARGUMENTS = ['RUN:15000,1,75', 'WLK:9000,1.5,75,180']
+EXPECTED = [
+    homework.read_package('RUN', [15000, 1, 75])
+    .show_training_info().get_message(),
+    homework.read_package('WLK', [9000, 1.5, 75, 180])
+    .show_training_info().get_message(),
+]
+
+
+@pytest.mark.parametrize('argument, expected', [
+    ('RUN:15000,1,75', ('RUN', [15000, 1, 75])),
+    ('SWM:720,1.5,80,25,40', ('SWM', [720, 1.5, 80, 25, 40])),
+])
+def test_parse_argument(argument, expected):
+    assert homework.parse_argument(argument) == expected
+
+
+def test_local_fallback(monkeypatch, tmp_path):
+    monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / 'missing.sock'))
+    with Capturing() as output:
+        assert client.run(ARGUMENTS) == 0
+    assert output == EXPECTED
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    path = str(tmp_path / 'homework.sock')
+    loop = asyncio.new_event_loop()
+    server = service.WorkoutServer()
+    loop.run_until_complete(server.start(path=path))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield path
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_remote(socket_path):
+    with Capturing() as output:
+        assert client.run(['--socket', socket_path, *ARGUMENTS]) == 0
+    assert output == EXPECTED
+    assert client.run(['--socket', socket_path, 'BIKE:1,2']) == 1
+
+
+@pytest.mark.parametrize('arguments', [
+    ['RUN'], ['BIKE:1,2'], ['RUN:1,x,3'], ['RUN:1,2'], ['--socket'],
+])
+def test_bad_arguments(monkeypatch, capsys, arguments):
+    monkeypatch.delenv(client.SOCKET_ENV, raising=False)
+    assert client.run(arguments) == 1
+    assert capsys.readouterr().err, 'Ошибка должна печататься в stderr.'
+
+
+@pytest.mark.parametrize('argument', ['RUN', 'RUN:', ':1,2', 'RUN:1,x'])
+def test_parse_argument_errors(argument):
+    with pytest.raises(ValueError):
+        homework.parse_argument(argument)
+
+
+def test_homework_cli_errors():
+    result = subprocess.run(
+        [sys.executable, 'homework.py', 'RUN:15000,1,75', 'BIKE:1,2'],
+        cwd=Path(homework.__file__).parent, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert 'Traceback' not in result.stderr and 'BIKE' in result.stderr
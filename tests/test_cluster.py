@@ -0,0 +1,63 @@
+from io import StringIO
+
+import pytest
+
+import cluster
+import stream
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12.5, 6]),
+] * 10
+ITEMS = [(index % 7, package) for index, package in enumerate(PACKAGES)]
+
+
+@pytest.fixture(scope='module')
+def coordinator():
+    with cluster.Coordinator(workers=2, chunk_size=3, retries=2,
+                             timeout=10) as coordinator:
+        yield coordinator
+
+
+def test_shard_is_stable():
+    assert cluster.shard_of('athlete-1', 4) == cluster.shard_of(
+        'athlete-1', 4)
+    assert {cluster.shard_of(athlete, 4) for athlete in range(100)} == {
+        0, 1, 2, 3}
+
+
+def test_results_in_input_order(coordinator):
+    messages, stats = coordinator.compute(ITEMS)
+    assert messages == list(stream.iter_messages(PACKAGES)), (
+        'Сообщения должны совпадать с локальным расчетом и идти '
+        'в порядке входа')
+    assert stats.packages == len(PACKAGES)
+    assert stats.chunks >= len(PACKAGES) // 3
+    assert stats.throughput > 0
+
+
+def test_failed_worker_is_restarted(coordinator):
+    coordinator.workers[0].process.kill()
+    coordinator.workers[0].process.join()
+    messages, stats = coordinator.compute(ITEMS)
+    assert messages == list(stream.iter_messages(PACKAGES))
+    assert stats.retries >= 1, 'Порция упавшего обработчика повторяется'
+
+
+def test_compute_error_is_raised(coordinator):
+    with pytest.raises(KeyError):
+        coordinator.compute([(1, ('XXX', [1, 2, 3]))])
+    messages, _ = coordinator.compute(ITEMS[:4])
+    assert len(messages) == 4
+
+
+def test_parse_sharded():
+    source = StringIO('{"athlete": "a", "workout_type": "RUN", '
+                      '"data": [15000, 1, 75]}\n\n'
+                      '["WLK", [9000, 1, 75, 180]]\n')
+    assert list(cluster.parse_sharded(source)) == [
+        ('a', ('RUN', [15000, 1, 75])),
+        (3, ('WLK', [9000, 1, 75, 180])),
+    ]
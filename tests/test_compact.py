@@ -0,0 +1,81 @@
+import pytest
+
+import batch
+import compact
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.mark.parametrize('training_class', [
+    homework.Running, homework.SportsWalking, homework.Swimming,
+])
+def test_training_fields_are_slotted(training_class):
+    slots = {name for cls in training_class.__mro__
+             for name in getattr(cls, '__slots__', ())}
+    for name in batch.field_names(training_class):
+        assert name in slots or '_' + name in slots, (
+            'Атрибуты тренировки должны храниться в __slots__.'
+        )
+    message = homework.InfoMessage('Running', 1, 2, 3, 4)
+    assert not hasattr(message, '__dict__')
+
+
+def test_column_typecodes():
+    assert compact.column_typecodes(homework.Swimming) == {
+        'action': 'q', 'duration': 'd', 'weight': 'd',
+        'length_pool': 'd', 'count_pool': 'q',
+    }
+    assert compact.column_typecodes(homework.Running, 'float32') == {
+        'action': 'i', 'duration': 'f', 'weight': 'f',
+    }
+
+
+def test_training_array_views():
+    training_array = compact.TrainingArray(
+        homework.Running, [[15000, 1, 75], [1206, 12, 6]])
+    assert len(training_array) == 2
+    assert training_array.nbytes == 2 * 3 * 8
+    view = training_array[1]
+    reference = homework.Running(1206, 12, 6)
+    assert isinstance(view, homework.Running)
+    assert view.get_distance() == reference.get_distance()
+    assert view.get_spent_calories() == reference.get_spent_calories()
+    assert [training.action for training in training_array] == [15000, 1206]
+    with pytest.raises(TypeError):
+        training_array.append([1, 2])
+
+
+def test_training_store_compute():
+    store = compact.TrainingStore()
+    store.extend(PACKAGES)
+    assert len(store) == 4
+    results = store.compute()
+    assert list(results['RUN'].calories) == [
+        homework.read_package(code, data).get_spent_calories()
+        for code, data in PACKAGES if code == 'RUN'
+    ]
+    assert list(results['SWM'].to_messages()) == [
+        homework.read_package(*PACKAGES[0]).show_training_info()
+    ]
+
+
+def test_training_store_float32():
+    store = compact.TrainingStore('float32')
+    store.extend(PACKAGES)
+    reference = compact.TrainingStore()
+    reference.extend(PACKAGES)
+    assert store.nbytes * 2 == reference.nbytes, (
+        'Во float32 колонки должны занимать вдвое меньше памяти.'
+    )
+    for code, result in store.compute().items():
+        expected = reference.compute()[code]
+        assert list(result.calories) == pytest.approx(
+            list(expected.calories), rel=1e-5)
+    with pytest.raises(ValueError):
+        compact.TrainingStore('float16')
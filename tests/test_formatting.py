@@ -0,0 +1,47 @@
+from io import StringIO
+
+import pytest
+
+import formatting
+import homework
+
+MESSAGES = [
+    homework.InfoMessage('Swimming', 1, 75, 1, 80),
+    homework.InfoMessage('Running', 4.0, 20.123456, 4.0005, -90.1032),
+    homework.InfoMessage('SportsWalking', 12, 6, 12, 1e9),
+]
+
+
+def test_compile_template():
+    template, names = formatting.compile_template(
+        '{a} {{x}} {b:.2f} {a!r}')
+    assert template == '{0} {{x}} {1:.2f} {2!r}'
+    assert names == ('a', 'b', 'a')
+
+
+@pytest.mark.parametrize('message', MESSAGES)
+def test_format_message_matches_get_message(message):
+    expected = homework.InfoMessage.MESSAGE_STRING.format(
+        training_type=message.training_type, duration=message.duration,
+        distance=message.distance, speed=message.speed,
+        calories=message.calories)
+    assert formatting.format_message(message) == expected
+    assert message.get_message() == expected
+
+
+def test_render_and_write():
+    expected = ''.join(message.get_message() + '\n' for message in MESSAGES)
+    formatter = formatting.format_message
+    assert formatter.render(MESSAGES) == expected
+    rows = [(message.training_type, message.duration, message.distance,
+             message.speed, message.calories) for message in MESSAGES]
+    assert formatter.render_rows(rows) == expected
+    target = StringIO()
+    assert formatter.write(MESSAGES, target, chunk_size=2) == 3
+    assert target.getvalue() == expected
+
+
+def test_single_field_template():
+    formatter = formatting.MessageFormatter('Тип: {training_type}')
+    assert formatter(MESSAGES[0]) == 'Тип: Swimming'
+    assert formatter.format_fields(training_type='Running') == 'Тип: Running'
@@ -0,0 +1,72 @@
+import json
+import urllib.request
+
+import pytest
+
+import homework
+import instrumentation
+
+
+@pytest.fixture
+def metrics():
+    instrumentation.metrics.reset()
+    with instrumentation.instrumented() as metrics:
+        yield metrics
+    instrumentation.metrics.reset()
+
+
+def test_disabled_leaves_classes_untouched():
+    methods = {name: vars(homework.Swimming).get(name)
+               for name in instrumentation.TRAINING_METHODS}
+    get_training_class = homework.get_training_class
+    with instrumentation.instrumented():
+        assert instrumentation.is_enabled()
+        assert homework.get_training_class is not get_training_class
+    assert not instrumentation.is_enabled()
+    assert homework.get_training_class is get_training_class
+    assert methods == {name: vars(homework.Swimming).get(name)
+                       for name in instrumentation.TRAINING_METHODS}
+
+
+def test_stages_are_counted(metrics):
+    message = homework.read_package('SWM', [720, 1, 80, 25, 40])
+    assert message.show_training_info().get_message() == (
+        'Тип тренировки: Swimming; Длительность: 1.000 ч.; '
+        'Дистанция: 0.994 км; Ср. скорость: 1.000 км/ч; '
+        'Потрачено ккал: 336.000.')
+    homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    with pytest.raises(KeyError):
+        homework.read_package('BIKE', [])
+
+    histograms = metrics.histograms
+    assert histograms[('dispatch', 'SWM')].count == 1
+    assert histograms[('dispatch', 'BIKE')].errors == 1
+    assert histograms[('show_training_info', 'Running')].count == 1
+    assert histograms[('get_mean_speed', 'Swimming')].count == 2
+    assert histograms[('get_message', 'Swimming')].count == 1
+    assert sum(histograms[('__init__', 'Running')].counts) == 1
+
+
+def test_exporters(metrics, tmp_path):
+    homework.read_package('WLK', [9000, 1, 75, 180]).show_training_info()
+    data = json.loads(metrics.to_json())
+    assert {item['stage'] for item in data} >= {'dispatch', 'get_distance'}
+
+    text = metrics.to_prometheus()
+    assert ('homework_stage_seconds_count{stage="get_spent_calories",'
+            'workout_type="SportsWalking"} 1') in text
+    assert 'le="+Inf"} 1' in text
+
+    path = tmp_path / 'metrics.prom'
+    metrics.write(str(path), 'prometheus')
+    assert path.read_text(encoding='utf-8') == text
+    with pytest.raises(ValueError):
+        metrics.write(str(path), 'xml')
+
+    server = instrumentation.start_http_server()
+    try:
+        url = 'http://127.0.0.1:%d/metrics' % server.server_address[1]
+        with urllib.request.urlopen(url) as response:
+            assert response.read().decode() == metrics.to_prometheus()
+    finally:
+        server.shutdown()
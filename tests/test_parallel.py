@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pytest
+
+import parallel
+import stream
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+] * 7
+
+
+def test_chunked():
+    assert list(parallel.chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(parallel.chunked([], 3)) == []
+    with pytest.raises(ValueError):
+        list(parallel.chunked([1], 0))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 100])
+def test_order_is_preserved(chunk_size):
+    expected = list(stream.iter_messages(PACKAGES))
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        result = list(parallel.iter_messages_parallel(
+            PACKAGES, workers=3, chunk_size=chunk_size, executor=executor))
+    assert result == expected
+
+
+def test_process_pool():
+    expected = list(stream.iter_messages(PACKAGES))
+    result = list(parallel.iter_messages_parallel(
+        PACKAGES, workers=2, chunk_size=5))
+    assert result == expected
+
+
+def test_process_stream_workers():
+    text = '["RUN", [15000, 1, 75]]\n' * 10
+    sequential, concurrent = StringIO(), StringIO()
+    stream.process_stream(StringIO(text), sequential)
+    stream.process_stream(StringIO(text), concurrent,
+                          chunk_size=3, workers=2)
+    assert concurrent.getvalue() == sequential.getvalue()
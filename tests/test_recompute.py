@@ -0,0 +1,116 @@
+import json
+from io import StringIO
+
+import pytest
+
+import recompute
+import stream
+
+PACKAGES = [
+    ['SWM', [720, 1, 80, 25, 40]],
+    ['RUN', [15000, 1, 75]],
+    ['WLK', [9000, 1, 75, 180]],
+] * 3
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'packages.jsonl'
+    path.write_text(''.join(json.dumps(package) + '\n'
+                            for package in PACKAGES), encoding='utf-8')
+    return str(path)
+
+
+def expected_output(source):
+    target = StringIO()
+    with open(source, encoding='utf-8') as file:
+        stream.process_stream(file, target)
+    return target.getvalue()
+
+
+def test_run_and_resume(source, tmp_path):
+    output_dir = str(tmp_path / 'out')
+    runner = recompute.BatchRunner(source, output_dir, chunk_size=4)
+    assert runner.run() == recompute.RunStats(3, 0, 9)
+    assert recompute.BatchRunner(source, output_dir, chunk_size=4).run() == (
+        recompute.RunStats(0, 3, 0))
+
+    runner.chunk_path(1).unlink()
+    checkpoint = json.loads(runner.checkpoint_path.read_text())
+    checkpoint['completed'].remove(1)
+    runner.checkpoint_path.write_text(json.dumps(checkpoint))
+    assert runner.run() == recompute.RunStats(1, 2, 4)
+
+    target = StringIO()
+    assert recompute.merge_outputs(output_dir, target) == 3
+    assert target.getvalue() == expected_output(source)
+
+
+def test_chunk_ranges(source, tmp_path):
+    output_dir = str(tmp_path / 'out')
+    first = recompute.BatchRunner(source, output_dir, 2, stop=2).run()
+    second = recompute.BatchRunner(source, output_dir, 2, start=2).run()
+    assert (first.computed, second.computed) == (2, 3)
+    target = StringIO()
+    recompute.merge_outputs(output_dir, target)
+    assert target.getvalue() == expected_output(source)
+
+
+def test_checkpoint_mismatch(source, tmp_path):
+    output_dir = str(tmp_path / 'out')
+    recompute.BatchRunner(source, output_dir, chunk_size=4).run()
+    runner = recompute.BatchRunner(source, output_dir, chunk_size=4)
+    runner.chunk_size = 5
+    with pytest.raises(ValueError):
+        runner.run()
+
+
+def test_cli(source, tmp_path):
+    merged = tmp_path / 'merged.txt'
+    assert recompute.run([source, str(tmp_path / 'out'), '--chunk-size', '5',
+                          '--merge', str(merged)]) == 0
+    assert merged.read_text(encoding='utf-8') == expected_output(source)
+
+
+def test_bad_packets_are_quarantined(tmp_path):
+    path = tmp_path / 'packages.jsonl'
+    path.write_text('["RUN", [15000, 1, 75]]\n'
+                    '["RUN", [15000, 0, 75]]\n'
+                    '{not json\n'
+                    '["WLK", [9000, 1, 75, 180]]\n', encoding='utf-8')
+    output_dir = tmp_path / 'out'
+    runner = recompute.BatchRunner(str(path), str(output_dir), chunk_size=2)
+    assert runner.run() == recompute.RunStats(2, 0, 2, 2)
+    rejected = [json.loads(line) for line in runner.rejected_path(0)
+                .read_text(encoding='utf-8').splitlines()]
+    rejected += [json.loads(line) for line in runner.rejected_path(1)
+                 .read_text(encoding='utf-8').splitlines()]
+    assert [record['reason'] for record in rejected] == [
+        'not_positive', 'bad_record']
+    assert runner.run() == recompute.RunStats(0, 2, 0)
+
+
+def test_range_skips_lines_without_parsing(tmp_path):
+    path = tmp_path / 'packages.jsonl'
+    path.write_text('{broken\n' * 4 + '["RUN", [15000, 1, 75]]\n' * 2,
+                    encoding='utf-8')
+    stats = recompute.BatchRunner(str(path), str(tmp_path / 'out'),
+                                  chunk_size=2, start=2).run()
+    assert stats == recompute.RunStats(1, 0, 2), (
+        'Строки до --start не должны разбираться.')
+
+
+def test_compute_errors_are_quarantined(tmp_path, monkeypatch):
+    monkeypatch.setattr(recompute, 'filter_packages',
+                        lambda packages, quarantine: packages)
+    path = tmp_path / 'packages.jsonl'
+    path.write_text('["RUN", [%d, 1, 75]]\n["RUN", [15000, 1, 75]]\n'
+                    % 10 ** 400, encoding='utf-8')
+    runner = recompute.BatchRunner(str(path), str(tmp_path / 'out'),
+                                   chunk_size=2)
+    assert runner.run() == recompute.RunStats(1, 0, 1, 1), (
+        'Ошибка расчета одного пакета не должна останавливать порцию.')
+    [record] = [json.loads(line) for line in runner.rejected_path(0)
+                .read_text(encoding='utf-8').splitlines()]
+    assert record['reason'] == 'compute_error'
+    assert runner.run() == recompute.RunStats(0, 1, 0)
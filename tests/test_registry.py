@@ -0,0 +1,133 @@
+import importlib.metadata
+
+import pytest
+
+import batch
+import binary
+import compact
+import homework
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(homework, '_TRAINING_DICT',
+                        dict(homework._TRAINING_DICT))
+    monkeypatch.setattr(homework, '_TRAINING_ARITY',
+                        dict(homework._TRAINING_ARITY))
+    monkeypatch.setattr(homework, '_plugins_loaded', True)
+    return homework._TRAINING_DICT
+
+
+class Cycling(homework.Training):
+    """Тренировка: велосипед."""
+
+    LEN_STEP: float = 5.0
+
+    def __init__(self, action, duration, weight, cadence=90):
+        super().__init__(action, duration, weight)
+        self.cadence = cadence
+
+    def get_spent_calories(self) -> float:
+        return self.get_mean_speed() * self.weight
+
+
+def test_builtin_codes():
+    assert homework._TRAINING_DICT == {
+        'RUN': homework.Running,
+        'WLK': homework.SportsWalking,
+        'SWM': homework.Swimming,
+    }
+    assert homework._TRAINING_ARITY == {
+        'RUN': (3, 3), 'WLK': (4, 4), 'SWM': (5, 5),
+    }
+
+
+def test_register_training(registry):
+    assert homework.register_training('CYC')(Cycling) is Cycling
+    assert homework._TRAINING_ARITY['CYC'] == (3, 4)
+    training = homework.read_package('CYC', [1000, 1, 70])
+    assert isinstance(training, Cycling)
+    assert homework.read_package('CYC', [1000, 1, 70, 80]).cadence == 80
+    with pytest.raises(TypeError):
+        homework.read_package('CYC', [1000, 1])
+
+
+def test_register_errors(registry):
+    with pytest.raises(ValueError):
+        homework.register_training('RUN')(Cycling)
+    with pytest.raises(TypeError):
+        homework.register_training('OBJ')(object)
+    homework.register_training('RUN')(homework.Running)
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1]),
+    ('WLK', [9000, 1, 75]),
+    ('SWM', [720, 1, 80, 25, 40, 1]),
+])
+def test_read_package_arity(workout_type, data):
+    with pytest.raises(TypeError):
+        homework.read_package(workout_type, data)
+
+
+def test_keyword_only_parameters(registry):
+    class Required(Cycling):
+        def __init__(self, action, duration, weight, *, cadence):
+            super().__init__(action, duration, weight, cadence)
+
+    class Optional(Cycling):
+        def __init__(self, action, duration, weight, *, cadence=90):
+            super().__init__(action, duration, weight, cadence)
+
+    with pytest.raises(TypeError):
+        homework.register_training('REQ')(Required)
+    assert 'REQ' not in homework._TRAINING_DICT
+    homework.register_training('OPT')(Optional)
+    assert homework._TRAINING_ARITY['OPT'] == (3, 3)
+    assert batch.field_names(Optional) == ('action', 'duration', 'weight')
+    assert batch.compute_packages([('OPT', [1000, 1, 70])]) == [
+        homework.read_package('OPT', [1000, 1, 70]).show_training_info()]
+
+
+def test_plugins_are_loaded_on_unknown_code(registry, monkeypatch):
+    class EntryPoint:
+        name = 'CYC'
+
+        def load(self):
+            return Cycling
+
+    class EntryPoints(list):
+        def select(self, group):
+            return self if group == homework.PLUGIN_GROUP else []
+
+    monkeypatch.setattr(importlib.metadata, 'entry_points',
+                        lambda: EntryPoints([EntryPoint()]))
+    monkeypatch.setattr(homework, '_plugins_loaded', False)
+    assert homework.get_training_class('CYC') is Cycling
+    with pytest.raises(KeyError):
+        homework.get_training_class('ROW')
+
+
+def test_optional_fields_in_batch_paths(registry, monkeypatch):
+    monkeypatch.setattr(binary, '_STRUCTS', dict(binary._STRUCTS))
+    homework.register_training('CYC')(Cycling)
+    packages = [('CYC', [1000, 1, 70]), ('CYC', [1000, 1, 70, 80])]
+    expected = [homework.read_package(*package).show_training_info()
+                for package in packages]
+    assert batch.compute_packages(packages) == expected, (
+        'Пропущенные необязательные значения должны заполняться '
+        'значениями по умолчанию.')
+    store = compact.TrainingStore()
+    store.extend(packages)
+    assert list(store.compute()['CYC'].to_messages()) == expected
+    assert list(store.arrays['CYC'].columns['cadence']) == [90, 80]
+    result = batch.compute_columns(
+        Cycling, {'action': [1000], 'duration': [1], 'weight': [70]})
+    assert list(result.to_messages()) == expected[:1]
+    assert (binary.encode_frame('CYC', [1000, 1, 70])
+            == binary.encode_frame('CYC', [1000, 1, 70, 90]))
+    for data in ([1000, 1], [1000, 1, 70, 80, 1]):
+        with pytest.raises(TypeError):
+            batch.group_packages([('CYC', data)])
+        with pytest.raises(TypeError):
+            store.append('CYC', data)
@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import homework
+import service
+
+PACKAGES = [
+    ['SWM', [720, 1, 80, 25, 40]],
+    ['RUN', [15000, 1, 75]],
+    ['WLK', [9000, 1, 75, 180]],
+]
+
+
+async def request(address, lines):
+    reader, writer = await asyncio.open_connection(*address[:2])
+    writer.write(''.join(line + '\n' for line in lines).encode())
+    await writer.drain()
+    writer.write_eof()
+    replies = [json.loads(line) async for line in reader]
+    writer.close()
+    return replies
+
+
+def test_replies_in_order():
+    async def scenario():
+        async with service.WorkoutServer(batch_window=0.01) as server:
+            await server.start()
+            lines = [json.dumps({'id': index, 'workout_type': code,
+                                 'data': data})
+                     for index, (code, data) in enumerate(PACKAGES * 5)]
+            return await request(server.address, lines), server.batches
+
+    replies, batches = asyncio.run(scenario())
+    assert [reply['id'] for reply in replies] == list(range(15))
+    for reply, (code, data) in zip(replies, PACKAGES * 5):
+        expected = homework.read_package(code, data).show_training_info()
+        assert reply['message'] == expected.get_message()
+        assert reply['calories'] == expected.calories
+    assert batches < 15, 'Пакеты должны собираться в пачки.'
+
+
+def test_concurrent_clients_share_batches():
+    async def scenario():
+        async with service.WorkoutServer(batch_window=0.05) as server:
+            await server.start()
+            lines = [json.dumps(package) for package in PACKAGES]
+            results = await asyncio.gather(*(
+                request(server.address, lines) for _ in range(4)))
+            return results, server.batches
+
+    results, batches = asyncio.run(scenario())
+    for replies in results:
+        assert [reply['training_type'] for reply in replies] == [
+            'Swimming', 'Running', 'SportsWalking']
+    assert batches < 4
+
+
+def test_errors_are_isolated():
+    async def scenario():
+        async with service.WorkoutServer() as server:
+            await server.start()
+            return await request(server.address, [
+                json.dumps(['RUN', [15000, 1, 75]]),
+                json.dumps({'id': 'bad', 'workout_type': 'BIKE',
+                            'data': [1]}),
+                '{not json',
+                json.dumps(['RUN', [15000, 1]]),
+                json.dumps(['WLK', [9000, 1, 75, 180]]),
+            ])
+
+    replies = asyncio.run(scenario())
+    assert 'message' in replies[0] and 'message' in replies[4]
+    assert replies[1]['id'] == 'bad' and 'KeyError' in replies[1]['error']
+    assert 'error' in replies[2] and 'error' in replies[3]
+
+
+def test_non_finite_results_are_errors():
+    async def scenario():
+        async with service.WorkoutServer(batch_window=0.01) as server:
+            await server.start()
+            return await request(server.address, [
+                '["RUN", [100, 0, 75]]',
+                '["RUN", [15000, 1, Infinity]]',
+                '["RUN", [15000, 1, 75]]',
+            ])
+
+    def reject(constant):
+        raise AssertionError(f'В ответе недопустимое значение {constant}')
+
+    replies = asyncio.run(scenario())
+    for reply in replies:
+        json.loads(json.dumps(reply), parse_constant=reject)
+    assert 'ZeroDivisionError' in replies[0]['error']
+    assert 'ValueError' in replies[1]['error']
+    assert 'message' in replies[2], (
+        'Ошибка одного пакета не должна задевать остальные.')
+
+
+def test_overflow_does_not_stop_batcher():
+    async def scenario():
+        async with service.WorkoutServer(batch_window=0.01) as server:
+            await server.start()
+            first = await asyncio.wait_for(request(server.address, [
+                json.dumps(['RUN', [10 ** 400, 1, 75]]),
+                json.dumps(['RUN', [15000, 1, 75]]),
+            ]), 5)
+            second = await asyncio.wait_for(request(server.address, [
+                json.dumps(['RUN', [15000, 1, 75]]),
+            ]), 5)
+            return first, second
+
+    first, second = asyncio.run(scenario())
+    assert 'OverflowError' in first[0]['error']
+    assert 'message' in first[1] and 'message' in second[0], (
+        'После ошибки пачки сервер должен продолжать отвечать.')
+
+
+def test_unix_socket(tmp_path):
+    async def scenario():
+        path = str(tmp_path / 'service.sock')
+        async with service.WorkoutServer() as server:
+            await server.start(path=path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(json.dumps(PACKAGES[1]).encode() + b'\n')
+            reply = json.loads(await reader.readline())
+            writer.close()
+            return reply
+
+    assert asyncio.run(scenario())['training_type'] == 'Running'
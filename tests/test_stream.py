@@ -0,0 +1,56 @@
+from io import StringIO
+
+import pytest
+
+import homework
+import stream
+
+EXPECTED = [
+    homework.read_package('SWM', [720, 1, 80, 25, 40])
+    .show_training_info().get_message(),
+    homework.read_package('RUN', [15000, 1, 75])
+    .show_training_info().get_message(),
+    homework.read_package('WLK', [9000, 1, 75, 180])
+    .show_training_info().get_message(),
+]
+
+
+@pytest.mark.parametrize('fmt, text', [
+    ('jsonl',
+     '["SWM", [720, 1, 80, 25, 40]]\n'
+     '{"workout_type": "RUN", "data": [15000, 1, 75]}\n'
+     '\n'
+     '["WLK", [9000, 1, 75, 180]]\n'),
+    ('csv',
+     'SWM,720,1,80,25,40\n'
+     'RUN,15000,1,75\n'
+     'WLK,9000,1.0,75,180\n'),
+])
+@pytest.mark.parametrize('chunk_size', [1, 2, 4096])
+def test_process_stream(fmt, text, chunk_size):
+    target = StringIO()
+    count = stream.process_stream(StringIO(text), target, fmt, chunk_size)
+    assert count == 3
+    assert target.getvalue().splitlines() == EXPECTED
+
+
+def test_iter_packages_is_lazy():
+    def lines():
+        yield '["RUN", [15000, 1, 75]]\n'
+        raise AssertionError('Пакеты должны читаться по одному.')
+
+    messages = stream.iter_messages(stream.iter_packages(lines()))
+    assert next(messages).get_message() == EXPECTED[1]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        stream.iter_packages(StringIO(''), 'xml')
+
+
+def test_run_files(tmp_path):
+    source = tmp_path / 'packages.csv'
+    source.write_text('RUN,15000,1,75\n', encoding='utf-8')
+    output = tmp_path / 'messages.txt'
+    assert stream.run([str(source), '-f', 'csv', '-o', str(output)]) == 0
+    assert output.read_text(encoding='utf-8').splitlines() == [EXPECTED[1]]
@@ -0,0 +1,73 @@
+import pytest
+
+import homework
+from timeseries import Sample, TimeSeriesSession
+
+
+def running_session():
+    session = TimeSeriesSession('RUN', weight=75, start=0)
+    for second in range(1, 3601):
+        session.add(Sample(second, action=4 + second % 2))
+    return session
+
+
+def test_totals_match_scalar_class():
+    session = running_session()
+    total = sum(4 + second % 2 for second in range(1, 3601))
+    assert session.info() == homework.Running(
+        total, 1.0, 75).show_training_info()
+
+
+def test_swimming_laps():
+    session = TimeSeriesSession('SWM', weight=80, length_pool=25)
+    session.add(Sample(100))
+    for minute in range(1, 61):
+        session.add(Sample(100 + minute * 60, action=12,
+                           count_pool=1 if minute % 3 else 0))
+    expected = homework.Swimming(720, 1.0, 80, 25, 40).show_training_info()
+    assert session.info() == expected
+
+
+def test_walking_requires_height():
+    with pytest.raises(TypeError):
+        TimeSeriesSession('WLK', weight=75)
+    session = TimeSeriesSession('WLK', weight=75, height=180, start=0)
+    session.add(Sample(1800, action=4500))
+    session.add(Sample(3600, action=4500))
+    assert session.info() == homework.SportsWalking(
+        9000, 1.0, 75, 180).show_training_info()
+
+
+def test_intervals_and_windows():
+    session = running_session()
+    halves = list(session.intervals(1800))
+    assert len(halves) == 2
+    assert halves[0] == homework.Running(
+        sum(4 + second % 2 for second in range(1, 1801)), 0.5, 75
+    ).show_training_info()
+    assert session.interval_info(1800, 3600) == halves[1]
+    assert session.window_info(1800) == halves[1]
+    assert session.window_info(10 ** 6) == session.info()
+    assert sum(info.distance for info in session.intervals(600)) == (
+        pytest.approx(session.info().distance))
+
+
+def test_incremental_window():
+    session = TimeSeriesSession('RUN', weight=75, start=0)
+    for second in range(1, 121):
+        session.add(Sample(second, action=3))
+        window = session.window_info(60)
+        assert window.duration == min(second, 60) / 3600
+
+
+def test_bad_samples():
+    session = TimeSeriesSession('RUN', weight=75)
+    with pytest.raises(ValueError):
+        session.info()
+    with pytest.raises(ValueError):
+        session.window_info(60)
+    session.add(Sample(10))
+    with pytest.raises(ValueError):
+        session.add(Sample(5))
+    with pytest.raises(ValueError):
+        session.interval_info(10, 10)
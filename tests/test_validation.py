@@ -0,0 +1,106 @@
+import json
+from io import StringIO
+
+import pytest
+
+import batch
+import homework
+import stream
+import validation
+
+
+@pytest.mark.parametrize('workout_type, data, reason', [
+    ('RUN', [15000, 1, 75], None),
+    ('SWM', [720, 1.5, 80, 25, 40], None),
+    ('WLK', [9000, 1, 75, 180], None),
+    ('BIKE', [1, 2, 3], validation.UNKNOWN_CODE),
+    ('RUN', [15000, 1], validation.BAD_ARITY),
+    ('RUN', [15000, '1', 75], validation.NOT_NUMBER),
+    ('RUN', [15000, True, 75], validation.NOT_NUMBER),
+    ('RUN', [15000, float('nan'), 75], validation.NOT_FINITE),
+    ('RUN', [10 ** 400, 1, 75], validation.NOT_FINITE),
+    ('RUN', [-10 ** 400, 1, 75], validation.NOT_FINITE),
+    ('RUN', [-1, 1, 75], validation.NEGATIVE),
+    ('RUN', [15000, 0, 75], validation.NOT_POSITIVE),
+    ('WLK', [9000, 1, 75, 0], validation.NOT_POSITIVE),
+    ('SWM', [720, 0.0, 80, 25, 40], validation.NOT_POSITIVE),
+])
+def test_check_package(workout_type, data, reason):
+    assert validation.check_package(workout_type, data) == reason
+    if reason is None:
+        homework.read_package(workout_type, data).show_training_info()
+
+
+PACKAGES = [
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [15000, 0, 75]),
+    ('WLK', [9000, 1, 75, 0]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('SWM', [720, 1, 80, 25]),
+]
+
+
+def test_filter_packages():
+    quarantine = validation.Quarantine()
+    valid = list(validation.filter_packages(PACKAGES, quarantine))
+    assert valid == [PACKAGES[0], PACKAGES[3]]
+    assert len(quarantine) == 3
+    assert quarantine.reasons == {validation.NOT_POSITIVE: 2,
+                                  validation.BAD_ARITY: 1}
+    assert quarantine.rejected[0] == ('RUN', [15000, 0, 75],
+                                      validation.NOT_POSITIVE)
+
+
+def test_filter_columns():
+    columns = {'action': [15000, 100, 200, 300],
+               'duration': [1, 0, float('inf'), 2],
+               'weight': [75, 70, 70, -1]}
+    quarantine = validation.Quarantine()
+    valid = validation.filter_columns('RUN', columns, quarantine)
+    assert list(valid['action']) == [15000]
+    assert [reason for *_, reason in quarantine.rejected] == [
+        validation.NOT_POSITIVE, validation.NOT_FINITE, validation.NEGATIVE]
+    result = batch.compute_batch('RUN', valid)
+    assert list(result.calories) == [
+        homework.Running(15000, 1, 75).get_spent_calories()]
+
+
+@pytest.mark.parametrize('use_numpy', [False, True])
+def test_filter_columns_matches_check_package(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(validation, 'np', None)
+    columns = {'action': [15000, True, '1500', 200, 10 ** 400],
+               'duration': [1, 1, 1, 1.0, 1],
+               'weight': [75, 70, 70, 80, 75]}
+    quarantine = validation.Quarantine()
+    valid = validation.filter_columns('RUN', columns, quarantine)
+    assert list(valid['action']) == [15000, 200]
+    assert [row[0] for _, row, _ in quarantine.rejected] == [
+        True, '1500', 10 ** 400]
+    assert quarantine.reasons == {validation.NOT_NUMBER: 2,
+                                  validation.NOT_FINITE: 1}, (
+        'Колонки и check_package должны отклонять одни и те же строки.'
+    )
+    assert list(validation.valid_mask('RUN', columns)) == [
+        True, False, False, True, False]
+
+
+def test_stream_quarantine(tmp_path):
+    text = ''.join(json.dumps(package) + '\n' for package in PACKAGES)
+    target, rejects = StringIO(), StringIO()
+    quarantine = validation.JsonlQuarantine(rejects)
+    assert stream.process_stream(StringIO(text), target,
+                                 quarantine=quarantine) == 2
+    records = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert [record['reason'] for record in records] == [
+        validation.NOT_POSITIVE, validation.NOT_POSITIVE,
+        validation.BAD_ARITY]
+
+    source = tmp_path / 'packages.jsonl'
+    source.write_text(text, encoding='utf-8')
+    path = tmp_path / 'rejects.jsonl'
+    stream.run([str(source), '-o', str(tmp_path / 'out.txt'),
+                '--quarantine', str(path)])
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 3
@@ -0,0 +1,72 @@
+import csv
+import json
+from io import BytesIO, StringIO
+
+import pytest
+
+import batch
+import writers
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+@pytest.fixture(params=['float64', 'float32'])
+def results(request):
+    return list(batch.compute_batches(
+        batch.group_packages(PACKAGES), request.param).values())
+
+
+def expected_rows(results):
+    return [(result.training_type, *map(float, row))
+            for result in results
+            for row in zip(result.duration, result.distance,
+                           result.speed, result.calories)]
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 1000])
+def test_write_csv(results, chunk_rows):
+    target = StringIO()
+    assert writers.write_csv(results, target, chunk_rows=chunk_rows) == 4
+    rows = list(csv.reader(StringIO(target.getvalue())))
+    assert tuple(rows[0]) == writers.COLUMNS
+    assert [(row[0], *map(float, row[1:])) for row in rows[1:]] == (
+        expected_rows(results))
+
+
+def test_write_jsonl(results):
+    target = StringIO()
+    assert writers.write_jsonl(results, target, chunk_rows=3) == 4
+    records = [json.loads(line) for line in target.getvalue().splitlines()]
+    assert [tuple(record.values()) for record in records] == (
+        expected_rows(results))
+
+
+def test_columnar_roundtrip(results):
+    target = BytesIO()
+    assert writers.write_columnar(results, target) == 4
+    decoded = writers.read_columnar(target.getvalue())
+    assert expected_rows(decoded) == expected_rows(results)
+    assert [result.training_type for result in decoded] == [
+        result.training_type for result in results]
+
+
+def test_columnar_errors(results):
+    with pytest.raises(ValueError):
+        writers.read_columnar(b'XXXX')
+    target = BytesIO()
+    writers.write_columnar(results, target)
+    with pytest.raises(ValueError):
+        writers.read_columnar(target.getvalue()[:-8])
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl', 'columnar'])
+def test_write_results(results, tmp_path, fmt):
+    path = str(tmp_path / f'results.{fmt}')
+    assert writers.write_results(results, path, fmt) == 4
+    with pytest.raises(ValueError):
+        writers.write_results(results, path, 'parquet')
@@ -0,0 +1,126 @@
+"""Тренировка как поток отметок датчиков с расчетом по интервалам.
+
+Отметка - это время в секундах и приращения счетчиков с предыдущей
+отметки: шагов или гребков (action) и бассейнов (count_pool). Сессия
+хранит накопленные суммы, поэтому новая отметка добавляется за O(1),
+а показатели любого интервала считаются за O(log n) без пересчета
+с начала. Показатели считают обычные классы тренировок, так что итог
+сессии совпадает с расчетом Running/SportsWalking/Swimming.
+"""
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from batch import field_names
+from homework import InfoMessage, Training, get_training_class
+
+SECONDS_IN_H: int = 3600
+COUNTED_FIELDS = ('action', 'count_pool')
+
+
+class Sample(NamedTuple):
+    """Отметка датчика."""
+
+    timestamp: float
+    action: int = 0
+    count_pool: int = 0
+
+
+class TimeSeriesSession:
+    """Сессия тренировки, собранная из отметок датчиков."""
+
+    def __init__(self,
+                 workout_type: str,
+                 weight: float,
+                 start: Optional[float] = None,
+                 **params: float) -> None:
+        self.training_class = get_training_class(workout_type)
+        self.names = field_names(self.training_class)
+        static = set(self.names) - {'duration', 'weight', *COUNTED_FIELDS}
+        if set(params) != static:
+            raise TypeError(f'Для {workout_type} нужны параметры: '
+                            + ', '.join(sorted(static)))
+        self.weight = weight
+        self.params = params
+        self.start = start
+        self.times = array('d')
+        self.totals: Dict[str, array] = {name: array('q')
+                                         for name in COUNTED_FIELDS}
+
+    def add(self, sample: Sample) -> None:
+        """Добавить отметку; время отметок не должно убывать."""
+        if self.start is None:
+            self.start = sample.timestamp
+        last = self.times[-1] if self.times else self.start
+        if sample.timestamp < last:
+            raise ValueError('Отметки должны идти по возрастанию времени.')
+        self.times.append(sample.timestamp)
+        for name in COUNTED_FIELDS:
+            totals = self.totals[name]
+            totals.append((totals[-1] if totals else 0)
+                          + getattr(sample, name))
+
+    def extend(self, samples) -> None:
+        for sample in samples:
+            self.add(sample)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def _total_at(self, name: str, timestamp: float) -> int:
+        """
+        Накопленное значение счетчика к моменту timestamp.
+        Отметки в момент начала сессии входят в ее первый интервал.
+        """
+        if timestamp <= self.start:
+            return 0
+        index = bisect_right(self.times, timestamp)
+        return self.totals[name][index - 1] if index else 0
+
+    def training(self, start: float, end: float) -> Training:
+        """Получить тренировку за интервал (start, end]."""
+        values = {
+            'duration': (end - start) / SECONDS_IN_H,
+            'weight': self.weight,
+            **self.params,
+        }
+        for name in COUNTED_FIELDS:
+            values[name] = (self._total_at(name, end)
+                            - self._total_at(name, start))
+        return self.training_class(*(values[name] for name in self.names))
+
+    def interval_info(self, start: float, end: float) -> InfoMessage:
+        """Показатели за интервал (start, end]."""
+        if end <= start:
+            raise ValueError('Интервал должен иметь положительную длину.')
+        return self.training(start, end).show_training_info()
+
+    def info(self) -> InfoMessage:
+        """Показатели за всю сессию."""
+        if not self.times:
+            raise ValueError('В сессии нет отметок.')
+        return self.interval_info(self.start, self.times[-1])
+
+    def window_info(self, seconds: float) -> InfoMessage:
+        """Показатели за последние seconds секунд."""
+        if not self.times:
+            raise ValueError('В сессии нет отметок.')
+        end = self.times[-1]
+        return self.interval_info(max(self.start, end - seconds), end)
+
+    def intervals(self, step: float) -> Iterator[InfoMessage]:
+        """Показатели по последовательным интервалам длиной step."""
+        if not self.times:
+            return
+        if step <= 0:
+            raise ValueError('Длина интервала должна быть положительной.')
+        end = self.times[-1]
+        bounds: List[float] = []
+        bound, index = self.start, 0
+        while bound < end:
+            bounds.append(bound)
+            index += 1
+            bound = self.start + index * step
+        bounds.append(end)
+        for start, end in zip(bounds, bounds[1:]):
+            yield self.interval_info(start, end)
@@ -0,0 +1,206 @@
+"""Проверка пакетов перед расчетом и карантин отклоненных пакетов."""
+import json
+import sys
+from collections import Counter
+from numbers import Real
+from typing import (IO, Dict, Iterable, Iterator, List, Mapping, Optional,
+                    Sequence, Tuple)
+
+import homework
+from batch import field_names
+from stream import Package
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость.
+    np = None
+
+UNKNOWN_CODE = 'unknown_code'
+BAD_ARITY = 'bad_arity'
+NOT_NUMBER = 'not_number'
+NOT_FINITE = 'not_finite'
+NEGATIVE = 'negative'
+NOT_POSITIVE = 'not_positive'
+BAD_RECORD = 'bad_record'
+COMPUTE_ERROR = 'compute_error'
+
+POSITIVE_FIELDS = frozenset(('duration', 'height'))
+
+Schema = Tuple[int, int, Tuple[int, ...]]
+
+_SCHEMAS: Dict[str, Schema] = {}
+_FAST_TYPES = frozenset((int, float))
+# Целые больше этого не переводятся в float: OverflowError в расчете.
+_FLOAT_MAX = sys.float_info.max
+
+
+def get_schema(workout_type: str) -> Schema:
+    """
+    Получить схему кода: допустимое число значений и позиции полей,
+    которые должны быть строго положительными (делители в формулах).
+    """
+    schema = _SCHEMAS.get(workout_type)
+    if schema is None:
+        names = field_names(homework.get_training_class(workout_type))
+        low, high = homework._TRAINING_ARITY[workout_type]
+        positive = tuple(index for index, name in enumerate(names)
+                         if name in POSITIVE_FIELDS)
+        schema = _SCHEMAS[workout_type] = (low, high, positive)
+    return schema
+
+
+def _find_reason(positive: Tuple[int, ...],
+                 data: Sequence) -> Optional[str]:
+    """Подробная проверка значений пакета с определением причины."""
+    for value in data:
+        if isinstance(value, bool) or not isinstance(value, Real):
+            return NOT_NUMBER
+        if not -_FLOAT_MAX <= value <= _FLOAT_MAX:
+            return NOT_FINITE
+        if value < 0:
+            return NEGATIVE
+    for index in positive:
+        if index < len(data) and not data[index] > 0:
+            return NOT_POSITIVE
+    return None
+
+
+def check_package(workout_type: str, data: Sequence) -> Optional[str]:
+    """Вернуть причину отказа или None для корректного пакета."""
+    schema = _SCHEMAS.get(workout_type)
+    if schema is None:
+        try:
+            schema = get_schema(workout_type)
+        except (KeyError, TypeError):
+            return UNKNOWN_CODE
+    low, high, positive = schema
+    if not low <= len(data) <= high:
+        return BAD_ARITY
+    for value in data:
+        if type(value) not in _FAST_TYPES or not 0 <= value <= _FLOAT_MAX:
+            return _find_reason(positive, data)
+    for index in positive:
+        if index < len(data) and not data[index] > 0:
+            return NOT_POSITIVE
+    return None
+
+
+class Quarantine:
+    """Приемник отклоненных пакетов с подсчетом причин."""
+
+    def __init__(self, keep: bool = True) -> None:
+        self.keep = keep
+        self.rejected: List[Tuple[str, list, str]] = []
+        self.reasons: Counter = Counter()
+
+    def put(self, workout_type: str, data: Sequence, reason: str) -> None:
+        self.reasons[reason] += 1
+        if self.keep:
+            self.rejected.append((workout_type, list(data), reason))
+
+    def __len__(self) -> int:
+        return sum(self.reasons.values())
+
+
+class JsonlQuarantine(Quarantine):
+    """Карантин, записывающий отклоненные пакеты в JSON Lines."""
+
+    def __init__(self, target: IO[str]) -> None:
+        super().__init__(keep=False)
+        self.target = target
+
+    def put(self, workout_type: str, data: Sequence, reason: str) -> None:
+        super().put(workout_type, data, reason)
+        record = {'workout_type': workout_type, 'data': list(data),
+                  'reason': reason}
+        self.target.write(json.dumps(record, default=str) + '\n')
+
+
+def filter_packages(packages: Iterable[Package],
+                    quarantine: Quarantine) -> Iterator[Package]:
+    """Пропустить корректные пакеты, остальные отправить в карантин."""
+    for workout_type, data in packages:
+        reason = check_package(workout_type, data)
+        if reason is None:
+            yield workout_type, data
+        else:
+            quarantine.put(workout_type, data, reason)
+
+
+def _numeric_arrays(columns: Sequence[Sequence]) -> Optional[list]:
+    """
+    Преобразовать колонки в массивы float64 или вернуть None, если
+    в них есть значения, которые check_package не считает числами:
+    строки, bool и прочие объекты. Строки и объекты numpy оставляет
+    в нечисловом dtype, а bool в смеси с числами становится 0 или 1,
+    поэтому типы проверяются только у таких значений.
+    """
+    arrays = []
+    for column in columns:
+        array = np.asarray(column)
+        if array.dtype.kind not in 'iuf':
+            return None
+        array = np.asarray(array, dtype=np.float64)
+        if not isinstance(column, np.ndarray):
+            suspects = np.flatnonzero((array == 0) | (array == 1))
+            if any(type(column[index]) is bool
+                   for index in suspects.tolist()):
+                return None
+        arrays.append(array)
+    return arrays
+
+
+def _array_mask(arrays: list, positive: Tuple[int, ...]):
+    """Маска конечных неотрицательных (для делителей - положительных)."""
+    mask = np.ones(len(arrays[0]), dtype=bool)
+    for index, array in enumerate(arrays):
+        mask &= array > 0 if index in positive else array >= 0
+        mask &= array <= _FLOAT_MAX
+    return mask
+
+
+def valid_mask(workout_type: str,
+               columns: Mapping[str, Sequence]) -> Sequence[bool]:
+    """Проверить колонки пачки целиком и вернуть маску корректных строк."""
+    positive = get_schema(workout_type)[2]
+    names = field_names(homework.get_training_class(workout_type))
+    ordered = [columns[name] for name in names]
+    arrays = _numeric_arrays(ordered) if np is not None else None
+    if arrays is not None:
+        return _array_mask(arrays, positive)
+    return [check_package(workout_type, row) is None
+            for row in zip(*ordered)]
+
+
+def filter_columns(workout_type: str,
+                   columns: Mapping[str, Sequence],
+                   quarantine: Quarantine) -> Dict[str, Sequence]:
+    """
+    Вернуть колонки только с корректными строками,
+    отклоненные строки отправить в карантин.
+    С numpy колонки возвращаются уже преобразованными в float64,
+    чтобы расчет пачки не преобразовывал их повторно.
+    """
+    positive = get_schema(workout_type)[2]
+    names = field_names(homework.get_training_class(workout_type))
+    ordered = [columns[name] for name in names]
+    arrays = _numeric_arrays(ordered) if np is not None else None
+    if arrays is not None:
+        mask = _array_mask(arrays, positive)
+        rejected = np.flatnonzero(~mask).tolist()
+    else:
+        mask = [check_package(workout_type, row) is None
+                for row in zip(*ordered)]
+        rejected = [index for index, valid in enumerate(mask) if not valid]
+    for index in rejected:
+        row = [column[index] for column in ordered]
+        quarantine.put(workout_type, row,
+                       check_package(workout_type, row) or NOT_NUMBER)
+    if arrays is not None:
+        if rejected:
+            arrays = [array[mask] for array in arrays]
+        return dict(zip(names, arrays))
+    if not rejected:
+        return dict(zip(names, ordered))
+    return {name: [value for value, valid in zip(column, mask) if valid]
+            for name, column in zip(names, ordered)}
@@ -0,0 +1,156 @@
+"""Запись результатов пакетного расчета в машиночитаемых форматах.
+
+Колоночный двоичный формат (.hwc):
+
+    magic   b'HWC1'
+    блок    name_len:u2 name:utf-8 rows:u8
+            duration[rows] distance[rows] speed[rows] calories[rows]
+
+Все числа little-endian, колонки - подряд идущие float64,
+поэтому при чтении они отображаются без копирования.
+"""
+import csv
+import json
+import struct
+import sys
+from array import array
+from itertools import repeat
+from typing import IO, Iterable, Iterator, List, Sequence
+
+from batch import BatchResult
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость.
+    np = None
+
+COLUMNS = ('training_type', 'duration', 'distance', 'speed', 'calories')
+NUMERIC_COLUMNS = COLUMNS[1:]
+CHUNK_ROWS: int = 65536
+MAGIC: bytes = b'HWC1'
+_NAME = struct.Struct('<H')
+_ROWS = struct.Struct('<Q')
+
+
+def _chunks(result: BatchResult, chunk_rows: int) -> Iterator[List[tuple]]:
+    """
+    Получить строки результата порциями по chunk_rows. Числа
+    приводятся к float Python: результаты float32 иначе не пишутся
+    в JSON.
+    """
+    for start in range(0, len(result), chunk_rows):
+        columns = (getattr(result, name)[start:start + chunk_rows]
+                   for name in NUMERIC_COLUMNS)
+        yield list(zip(repeat(result.training_type),
+                       *(column.tolist() if hasattr(column, 'tolist')
+                         else column for column in columns)))
+
+
+def write_csv(results: Iterable[BatchResult],
+              target: IO[str],
+              header: bool = True,
+              chunk_rows: int = CHUNK_ROWS) -> int:
+    """Записать результаты в CSV, вернуть количество строк."""
+    writer = csv.writer(target, lineterminator='\n')
+    if header:
+        writer.writerow(COLUMNS)
+    count = 0
+    for result in results:
+        for chunk in _chunks(result, chunk_rows):
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def write_jsonl(results: Iterable[BatchResult],
+                target: IO[str],
+                chunk_rows: int = CHUNK_ROWS) -> int:
+    """Записать результаты в JSON Lines, вернуть количество строк."""
+    count = 0
+    for result in results:
+        for chunk in _chunks(result, chunk_rows):
+            target.write(''.join([
+                json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False)
+                + '\n' for row in chunk]))
+            count += len(chunk)
+    return count
+
+
+def _column_bytes(column: Sequence[float]) -> bytes:
+    """Получить байты колонки как little-endian float64."""
+    if np is not None and isinstance(column, np.ndarray):
+        return np.ascontiguousarray(column, dtype='<f8').tobytes()
+    if not (isinstance(column, array) and column.typecode == 'd'):
+        column = array('d', column)
+    if sys.byteorder != 'little':
+        column = array('d', column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_columnar(results: Iterable[BatchResult], target: IO[bytes]) -> int:
+    """Записать результаты в колоночный двоичный формат."""
+    target.write(MAGIC)
+    count = 0
+    for result in results:
+        name = result.training_type.encode('utf-8')
+        target.write(_NAME.pack(len(name)) + name
+                     + _ROWS.pack(len(result)))
+        for column in NUMERIC_COLUMNS:
+            target.write(_column_bytes(getattr(result, column)))
+        count += len(result)
+    return count
+
+
+def _column_view(buffer: memoryview, rows: int) -> Sequence[float]:
+    if np is not None:
+        return np.frombuffer(buffer, dtype='<f8', count=rows)
+    if sys.byteorder != 'little':
+        column = array('d', buffer.tobytes())
+        column.byteswap()
+        return column
+    return buffer.cast('d')
+
+
+def read_columnar(buffer) -> List[BatchResult]:
+    """Прочитать результаты из колоночного формата без копирования."""
+    view = memoryview(buffer)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError('Неизвестный формат: ожидался заголовок HWC1.')
+    offset = len(MAGIC)
+    results = []
+    while offset < len(view):
+        (name_size,) = _NAME.unpack_from(view, offset)
+        offset += _NAME.size
+        name = bytes(view[offset:offset + name_size]).decode('utf-8')
+        offset += name_size
+        (rows,) = _ROWS.unpack_from(view, offset)
+        offset += _ROWS.size
+        size = rows * 8
+        if offset + size * len(NUMERIC_COLUMNS) > len(view):
+            raise ValueError(f'Обрезанный блок {name}.')
+        columns = []
+        for _ in NUMERIC_COLUMNS:
+            columns.append(_column_view(view[offset:offset + size], rows))
+            offset += size
+        results.append(BatchResult(name, *columns))
+    return results
+
+
+WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+}
+
+
+def write_results(results: Iterable[BatchResult], path: str,
+                  fmt: str = 'csv') -> int:
+    """Записать результаты в файл в формате csv, jsonl или columnar."""
+    if fmt == 'columnar':
+        with open(path, 'wb') as file:
+            return write_columnar(results, file)
+    if fmt not in WRITERS:
+        raise ValueError(f'Неизвестный формат: {fmt}. Доступные форматы: '
+                         + ', '.join([*WRITERS, 'columnar']))
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        return WRITERS[fmt](results, file)